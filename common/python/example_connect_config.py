@@ -86,24 +86,25 @@ def run_example(
     osc_index = 0
     demod_rate = 10e3
     time_constant = 1e-6
+    sigin_base = f"/{device}/sigins/{in_channel}"
+    demod_base = f"/{device}/demods/{demod_index}"
+    osc_base = f"/{device}/oscs/{osc_index}"
+    sigout_base = f"/{device}/sigouts/{out_channel}"
     exp_setting = [
-        ["/%s/sigins/%d/ac" % (device, in_channel), 0],
-        ["/%s/sigins/%d/range" % (device, in_channel), 2 * amplitude],
-        ["/%s/demods/%d/enable" % (device, demod_index), 1],
-        ["/%s/demods/%d/rate" % (device, demod_index), demod_rate],
-        ["/%s/demods/%d/adcselect" % (device, demod_index), in_channel],
-        ["/%s/demods/%d/order" % (device, demod_index), 4],
-        ["/%s/demods/%d/timeconstant" % (device, demod_index), time_constant],
-        ["/%s/demods/%d/oscselect" % (device, demod_index), osc_index],
-        ["/%s/demods/%d/harmonic" % (device, demod_index), 1],
-        ["/%s/oscs/%d/freq" % (device, osc_index), 400e3],
-        ["/%s/sigouts/%d/on" % (device, out_channel), 1],
-        ["/%s/sigouts/%d/enables/%d" % (device, out_channel, out_mixer_channel), 1],
-        ["/%s/sigouts/%d/range" % (device, out_channel), 1],
-        [
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            amplitude,
-        ],
+        [f"{sigin_base}/ac", 0],
+        [f"{sigin_base}/range", 2 * amplitude],
+        [f"{demod_base}/enable", 1],
+        [f"{demod_base}/rate", demod_rate],
+        [f"{demod_base}/adcselect", in_channel],
+        [f"{demod_base}/order", 4],
+        [f"{demod_base}/timeconstant", time_constant],
+        [f"{demod_base}/oscselect", osc_index],
+        [f"{demod_base}/harmonic", 1],
+        [f"{osc_base}/freq", 400e3],
+        [f"{sigout_base}/on", 1],
+        [f"{sigout_base}/enables/{out_mixer_channel}", 1],
+        [f"{sigout_base}/range", 1],
+        [f"{sigout_base}/amplitudes/{out_mixer_channel}", amplitude],
     ]
     daq.set(exp_setting)
 
@@ -119,11 +120,11 @@ def run_example(
     # Obtain one demodulator sample via ziDAQServer's low-level getSample()
     # method - for extended data acquisition it's preferable to use
     # ziDAQServer's poll() method or the ziDAQRecorder class.
-    sample = daq.getSample("/%s/demods/%d/sample" % (device, demod_index))
-    # Calculate the demodulator's magnitude and phase and add them to the sample
-    # dict.
-    sample["R"] = np.abs(sample["x"] + 1j * sample["y"])
-    sample["phi"] = np.angle(sample["x"] + 1j * sample["y"])
+    sample = daq.getSample(f"{demod_base}/sample")
+    # Calculate the demodulator's magnitude and add it to the sample dict. Use the
+    # real-valued hypot to avoid building a complex array. (The phase is not used
+    # in this example, it can be obtained with np.arctan2(sample["y"], sample["x"]).)
+    sample["R"] = np.hypot(sample["x"], sample["y"])
     print(f"Measured RMS amplitude is {sample['R'][0]:.3e} V.")
 
 
@@ -34,6 +34,8 @@ Options:
                            it requires minor tweaking) [default = False]
     -a --filename FILE     If specified, additionally save the data to a directory
                            structure/filename specified by filename. [default: None]
+    --csv                  Save the data as CSV instead of the binary Matlab format
+                           (slower and larger files).
     --no-plot              Hide plot of the recorded data.
 
 Raises:
@@ -44,11 +46,13 @@ See the LabOne Programming Manual for further help:
 https://docs.zhinst.com/labone_programming_manual/
 """
 
+import math
+import queue
+import threading
 import time
 import numpy as np
 import zhinst.utils
 from zhinst.core import ziListEnum
-import matplotlib.pyplot as plt
 
 
 def run_example(
@@ -58,6 +62,7 @@ def run_example(
     hf2: bool = False,
     plot: bool = True,
     filename: str = "",
+    csv: bool = False,
 ):
     """run the example."""
 
@@ -86,7 +91,7 @@ def run_example(
     # Check the device has demodulators.
     flags = ziListEnum.recursive | ziListEnum.absolute | ziListEnum.streamingonly
     streaming_nodes = daq.listNodes(f"/{device}", flags)
-    if demod_path not in (node.lower() for node in streaming_nodes):
+    if demod_path not in {node.lower() for node in streaming_nodes}:
         print(
             f"Device {device} does not have demodulators. Please modify the example to specify",
             "a valid signal_path based on one or more of the following streaming nodes: ",
@@ -98,8 +103,8 @@ def run_example(
 
     # Defined the total time we would like to record data for and its sampling rate.
     # total_duration: Time in seconds: This examples stores all the acquired data in the `data`
-    # dict - remove this continuous storing in read_data_update_plot before increasing the size
-    # of total_duration!
+    # dict, in buffers preallocated for num_bursts bursts of num_cols samples each - keep an eye
+    # on the memory footprint (8 bytes per sample and signal) when increasing total_duration!
     total_duration = 5
     module_sampling_rate = 30000  # Number of points/second
     burst_duration = 0.2  # Time in seconds for each data burst/segment.
@@ -154,7 +159,8 @@ def run_example(
         # 'save/fileformat' - The file format to use for the saved data.
         #    0 - Matlab
         #    1 - CSV
-        daq_module.set("save/fileformat", 1)
+        # The binary Matlab format is considerably faster to write and smaller.
+        daq_module.set("save/fileformat", 1 if csv else 0)
         # 'save/filename' - Each file will be saved to a
         # new directory in the Zurich Instruments user directory with the name
         # filename_NNN/filename_NNN/
@@ -163,59 +169,129 @@ def run_example(
         # to file each time read() is called.
         daq_module.set("save/saveonread", 1)
 
+    # Dictionaries to store all the acquired data, preallocated for the whole measurement.
     data = {}
-    # A dictionary to store all the acquired data.
+    timestamps = {}
+    # The time in seconds since the first sample, used as x-data of the plot.
+    times = {}
+    # The number of bursts already stored per signal path.
+    write_index = {}
+    # Subscribe to all signals with a single call.
+    print("Subscribing to ", ", ".join(signal_paths))
+    daq_module.subscribe(signal_paths)
     for signal_path in signal_paths:
-        print("Subscribing to ", signal_path)
-        daq_module.subscribe(signal_path)
-        data[signal_path] = []
+        data[signal_path] = np.empty((num_bursts, num_cols))
+        timestamps[signal_path] = np.empty((num_bursts, num_cols), dtype=np.int64)
+        times[signal_path] = np.empty((num_bursts, num_cols))
+        write_index[signal_path] = 0
+    # The range of all values acquired so far, used to scale the y-axis of the plot.
+    value_range = [np.inf, -np.inf]
 
     clockbase = float(daq.getInt(f"/{device}/clockbase"))
+    # Multiply by the inverse instead of dividing every sample by the clockbase.
+    inv_clockbase = 1.0 / clockbase
     if plot:
+        # Only import Matplotlib (and initialize a GUI backend) if we plot.
+        import matplotlib.pyplot as plt
+
         fig, axis = plt.subplots()
         axis.set_xlabel("Time ($s$)")
         axis.set_ylabel("Subscribed signals")
         axis.set_xlim([0, total_duration])
+        # One line per signal, extended with every new burst. The lines are
+        # animated, i.e. only drawn explicitly by update_plot().
+        lines = {
+            signal_path: axis.plot([], [], animated=True)[0]
+            for signal_path in signal_paths
+        }
         plt.ion()
-
-    ts0 = np.nan
+        # Show the window now, the updates below do not go through plt.pause().
+        plt.show(block=False)
+        # Render the (empty) figure once and cache it as background for blitting:
+        # Subsequent updates only draw the lines and the title on top of the
+        # cached background instead of redrawing the whole figure.
+        fig.canvas.draw()
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+        ylim = None
+        # Limit the plot updates to 20 per second, faster updates are not visible
+        # anyway and only slow down the processing of the acquired data.
+        min_draw_interval = 0.05
+        last_draw = -np.inf
+
+    def update_plot(progress, force=False):
+        """
+        Draw the lines and the progress in the title by blitting. Skip the update
+        if the last one happened less than min_draw_interval ago unless `force`.
+        """
+        nonlocal background, ylim, last_draw
+        if not force and time.monotonic() - last_draw < min_draw_interval:
+            return
+        value_min, value_max = value_range
+        if value_min <= value_max and (
+            ylim is None or value_min < ylim[0] or value_max > ylim[1]
+        ):
+            # The new data does not fit the current y-axis, the background
+            # (including the axis ticks) needs to be rendered again.
+            margin = 0.05 * (value_max - value_min)
+            axis.set_ylim(value_min - margin, value_max + margin)
+            ylim = axis.get_ylim()
+            axis.set_title("")
+            fig.canvas.draw()
+            background = fig.canvas.copy_from_bbox(fig.bbox)
+        fig.canvas.restore_region(background)
+        for line in lines.values():
+            axis.draw_artist(line)
+        axis.set_title(f"Progress of data acquisition: {100 * progress:.2f}%.")
+        axis.draw_artist(axis.title)
+        fig.canvas.blit(fig.bbox)
+        fig.canvas.flush_events()
+        last_draw = time.monotonic()
+
+    ts0 = float("nan")
     read_count = 0
+    # The module returns lower case node paths; convert the subscribed paths only once.
+    signal_paths_lower = [signal_path.lower() for signal_path in signal_paths]
 
-    def read_data_update_plot(data, timestamp0):
+    def process_data_update_plot(data_read, progress, data, timestamp0):
         """
-        Read the acquired data out from the module and plot it. Raise an
-        AssertionError if no data is returned.
+        Store the data read out from the module and plot it.
         """
-        data_read = daq_module.read(True)
-        returned_signal_paths = [
-            signal_path.lower() for signal_path in data_read.keys()
-        ]
-        progress = daq_module.progress()[0]
+        returned_signal_paths = {signal_path.lower() for signal_path in data_read}
         # Loop over all the subscribed signals:
-        for signal_path in signal_paths:
-            if signal_path.lower() in returned_signal_paths:
+        for signal_path, signal_path_lower in zip(signal_paths, signal_paths_lower):
+            if signal_path_lower in returned_signal_paths:
                 # Loop over all the bursts for the subscribed signal. More than
                 # one burst may be returned at a time, in particular if we call
                 # read() less frequently than the burst_duration.
-                for index, signal_burst in enumerate(data_read[signal_path.lower()]):
-                    if np.any(np.isnan(timestamp0)):
+                for index, signal_burst in enumerate(data_read[signal_path_lower]):
+                    timestamp_row = signal_burst["timestamp"][0]
+                    value = signal_burst["value"][0]
+                    if math.isnan(timestamp0):
                         # Set our first timestamp to the first timestamp we obtain.
-                        timestamp0 = signal_burst["timestamp"][0, 0]
-                    # Convert from device ticks to time in seconds.
-                    t = (signal_burst["timestamp"][0, :] - timestamp0) / clockbase
-                    value = signal_burst["value"][0, :]
-                    if plot:
-                        axis.plot(t, value)
-                    num_samples = len(signal_burst["value"][0, :])
-                    dt = (
-                        signal_burst["timestamp"][0, -1]
-                        - signal_burst["timestamp"][0, 0]
-                    ) / clockbase
-                    data[signal_path].append(signal_burst)
+                        timestamp0 = timestamp_row[0]
+                    num_samples = value.size
+                    dt = (timestamp_row[-1] - timestamp_row[0]) * inv_clockbase
+                    burst_index = write_index[signal_path]
+                    # Convert from device ticks to time in seconds, in place.
+                    t = times[signal_path][burst_index]
+                    np.subtract(timestamp_row, timestamp0, out=t, dtype=np.float64)
+                    t *= inv_clockbase
+                    np.copyto(data[signal_path][burst_index], value)
+                    np.copyto(timestamps[signal_path][burst_index], timestamp_row)
+                    write_index[signal_path] = burst_index + 1
+                    value_range[0] = min(value_range[0], value.min())
+                    value_range[1] = max(value_range[1], value.max())
                     print(
                         f"Read: {read_count}, progress: {100 * progress:.2f}%.",
                         f"Burst {index}: {signal_path} contains {num_samples} spanning {dt:.2f} s.",
                     )
+                if plot:
+                    # The stored bursts are contiguous, plot them as one line.
+                    num_stored = write_index[signal_path]
+                    lines[signal_path].set_data(
+                        times[signal_path][:num_stored].ravel(),
+                        data[signal_path][:num_stored].ravel(),
+                    )
             else:
                 # Note: If we read before the next burst has finished, there may be no new data.
                 # No action required.
@@ -223,42 +299,107 @@ def run_example(
 
         # Update the plot.
         if plot:
-            axis.set_title(f"Progress of data acquisition: {100 * progress:.2f}%.")
-            plt.pause(0.01)
-            fig.canvas.draw()
+            update_plot(progress)
         return data, timestamp0
 
+    # The module is read in a background thread, so that slow plot updates in the
+    # main thread do not delay the read out. Only the main thread touches `data` and
+    # Matplotlib, the reader thread only passes the read data on via the queue.
+    read_queue = queue.Queue(maxsize=32)
+    stop_reading = threading.Event()
+
+    def read_data():
+        """
+        Read the acquired data out from the module until it has finished and
+        put it into the queue. None is put into the queue when done.
+        """
+        # The maximum time to wait before reading out new data (adapted in the loop).
+        t_update = 0.9 * burst_duration
+        try:
+            while not stop_reading.is_set():
+                t0_loop = time.monotonic()
+                # Check finished() before reading: There may be new data between the
+                # last read() and calling finished(), this read also returns it.
+                finished = daq_module.finished()
+                data_read = daq_module.read(True)
+                bursts_last_read = max(
+                    (len(data_read.get(path, [])) for path in signal_paths_lower),
+                    default=0,
+                )
+                # If we read before the next burst has finished there is nothing
+                # to process, skip querying the progress in that case.
+                if bursts_last_read:
+                    read_queue.put((data_read, daq_module.progress()[0]))
+                if finished:
+                    break
+                # Adapt the read interval to the rate the bursts arrive at: If several
+                # bursts were returned at once we are falling behind and should read more
+                # often, if none was returned we can afford to wait longer.
+                if bursts_last_read > 1:
+                    t_update *= 0.5
+                elif bursts_last_read == 0:
+                    t_update *= 1.2
+                t_update = min(max(t_update, 0.05 * burst_duration), burst_duration)
+                # We don't need to update too quickly.
+                time.sleep(max(0, t_update - (time.monotonic() - t0_loop)))
+        except Exception as error:
+            # Pass the error on to be raised in the main thread.
+            read_queue.put(error)
+        finally:
+            read_queue.put(None)
+
     # Start recording data.
     daq_module.execute()
 
     # Record data in a loop with timeout.
     timeout = 1.5 * total_duration
-    t0_measurement = time.time()
-    # The maximum time to wait before reading out new data.
-    t_update = 0.9 * burst_duration
-    while not daq_module.finished():
-        t0_loop = time.time()
-        if time.time() - t0_measurement > timeout:
-            raise Exception(
-                f"Timeout after {timeout} s - recording not complete."
-                "Are the streaming nodes enabled?"
-                "Has a valid signal_path been specified?"
-            )
-        data, ts0 = read_data_update_plot(data, ts0)
-        read_count += 1
-        # We don't need to update too quickly.
-        time.sleep(max(0, t_update - (time.time() - t0_loop)))
-
-    # There may be new data between the last read() and calling finished().
-    data, _ = read_data_update_plot(data, ts0)
+    t_deadline = time.monotonic() + timeout
+    reader = threading.Thread(target=read_data)
+    reader.start()
+    progress = 0.0
+    try:
+        while True:
+            try:
+                item = read_queue.get(timeout=max(0, t_deadline - time.monotonic()))
+            except queue.Empty:
+                raise Exception(
+                    f"Timeout after {timeout} s - recording not complete."
+                    "Are the streaming nodes enabled?"
+                    "Has a valid signal_path been specified?"
+                ) from None
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            data_read, progress = item
+            data, ts0 = process_data_update_plot(data_read, progress, data, ts0)
+            read_count += 1
+    finally:
+        stop_reading.set()
+        # Empty the queue in case the reader is blocked waiting for free space.
+        while reader.is_alive():
+            try:
+                read_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        reader.join()
+
+    # Make sure the plot shows all data, the last update might have been skipped.
+    if plot:
+        update_plot(progress, force=True)
+        # Include the lines in the figure's regular drawing again, so that they're
+        # still shown when the figure is redrawn, e.g. resized or saved.
+        for line in lines.values():
+            line.set_animated(False)
+        fig.canvas.draw()
 
     # Before exiting, make sure that saving to file is complete (it's done in the background)
     # by testing the 'save/save' parameter.
     timeout = 1.5 * total_duration
-    t0 = time.time()
+    t_deadline = time.monotonic() + timeout
     while daq_module.getInt("save/save") != 0:
         time.sleep(0.1)
-        if time.time() - t0 > timeout:
+        if time.monotonic() > t_deadline:
             raise Exception(f"Timeout after {timeout} s before data save completed.")
 
     if not plot:
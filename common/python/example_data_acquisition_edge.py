@@ -53,11 +53,16 @@ See the LabOne Programming Manual for further help:
 https://docs.zhinst.com/labone_programming_manual/
 """
 
+import math
 import time
 import numpy as np
 import zhinst.utils
 import matplotlib.pyplot as plt
 
+# The first bit of a grid's header flags is set to 1 when the grid is complete and
+# the configured number of repetitions have completed.
+_GRID_COMPLETE = 0x1
+
 
 def run_example(
     device_id: str,
@@ -100,32 +105,32 @@ def run_example(
     demod_rate = 10e3
     time_constant = 0.01
     frequency = 400e3
+    # Build the node paths used repeatedly below only once.
+    sigin_path = f"/{device}/sigins/{in_channel}"
+    demod_path = f"/{device}/demods/{demod_index}"
+    sigout_path = f"/{device}/sigouts/{out_channel}"
+    amplitude_path = f"{sigout_path}/amplitudes/{out_mixer_channel}"
     exp_setting = [
-        ["/%s/sigins/%d/ac" % (device, in_channel), 0],
-        ["/%s/sigins/%d/imp50" % (device, in_channel), 0],
-        ["/%s/sigins/%d/range" % (device, in_channel), 3 * amplitude],
-        ["/%s/demods/%d/enable" % (device, demod_index), 1],
-        ["/%s/demods/%d/rate" % (device, demod_index), demod_rate],
-        ["/%s/demods/%d/adcselect" % (device, demod_index), in_channel],
-        ["/%s/demods/%d/order" % (device, demod_index), 4],
-        ["/%s/demods/%d/timeconstant" % (device, demod_index), time_constant],
-        ["/%s/demods/%d/oscselect" % (device, demod_index), osc_index],
-        ["/%s/demods/%d/harmonic" % (device, demod_index), 1],
-        ["/%s/oscs/%d/freq" % (device, osc_index), frequency],
-        ["/%s/sigouts/%d/on" % (device, out_channel), 1],
-        ["/%s/sigouts/%d/enables/%d" % (device, out_channel, out_mixer_channel), 1],
-        ["/%s/sigouts/%d/range" % (device, out_channel), 1],
-        [
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            amplitude,
-        ],
+        [f"{sigin_path}/ac", 0],
+        [f"{sigin_path}/imp50", 0],
+        [f"{sigin_path}/range", 3 * amplitude],
+        [f"{demod_path}/enable", 1],
+        [f"{demod_path}/rate", demod_rate],
+        [f"{demod_path}/adcselect", in_channel],
+        [f"{demod_path}/order", 4],
+        [f"{demod_path}/timeconstant", time_constant],
+        [f"{demod_path}/oscselect", osc_index],
+        [f"{demod_path}/harmonic", 1],
+        [f"/{device}/oscs/{osc_index}/freq", frequency],
+        [f"{sigout_path}/on", 1],
+        [f"{sigout_path}/enables/{out_mixer_channel}", 1],
+        [f"{sigout_path}/range", 1],
+        [amplitude_path, amplitude],
     ]
     daq.set(exp_setting)
 
     # Wait for the demodulator filter to settle.
-    timeconstant_set = daq.getDouble(
-        "/%s/demods/%d/timeconstant" % (device, demod_index)
-    )
+    timeconstant_set = daq.getDouble(f"{demod_path}/timeconstant")
     time.sleep(10 * timeconstant_set)
 
     # Perform a global synchronisation between the device and the data server:
@@ -148,7 +153,7 @@ def run_example(
     # Set the device that will be used for the trigger - this parameter must be set.
     daq_module.set("device", device)
     # We will trigger on the demodulator sample's R value.
-    trigger_path = "/%s/demods/%d/sample.r" % (device, demod_index)
+    trigger_path = f"{demod_path}/sample.r"
     triggernode = trigger_path
     daq_module.set("triggernode", triggernode)
     # Use an edge trigger.
@@ -157,7 +162,7 @@ def run_example(
     daq_module.set("edge", 1)  # 1 = positive
     # The set the trigger level.
     # Scale by 1/sqrt(2) due to the demodulator's R RMS value.
-    trigger_level = 0.5 * (sigouts_low + sigouts_high) / np.sqrt(2)
+    trigger_level = 0.5 * (sigouts_low + sigouts_high) / math.sqrt(2)
     print(f"Setting 0/level to {trigger_level:.3f}.")
     daq_module.set("level", trigger_level)
     # Set the trigger hysteresis to a percentage of the trigger level: This
@@ -179,7 +184,7 @@ def run_example(
     daq_module.set("holdoff/time", 0.100)
     trigger_delay = -0.020
     daq_module.set("delay", trigger_delay)
-    demod_rate = daq.getDouble("/%s/demods/%d/rate" % (device, demod_index))
+    demod_rate = daq.getDouble(f"{demod_path}/rate")
     # 'grid/mode' - Specify the interpolation method of
     #   the returned data samples.
     #
@@ -211,7 +216,7 @@ def run_example(
 
     # We subscribe to the same demodulator sample we're triggering on, but we
     # could additionally subscribe to other node paths.
-    signal_path = "/%s/demods/%d/sample.r" % (device, demod_index)
+    signal_path = f"{demod_path}/sample.r"
     if repetitions > 1:
         signal_path += ".avg"
     daq_module.subscribe(signal_path)
@@ -230,6 +235,46 @@ def run_example(
     # to the set command.
     daq_module.set("save/fileformat", "hdf5")
 
+    # Get the sampling rate of the device's ADCs, the device clockbase.
+    clockbase = float(daq.getInt(f"/{device}/clockbase"))
+
+    # Preallocate the arrays the signal segments are read into: The memory needed
+    # is known up-front and does not grow while the module is read out.
+    values = np.empty((trigger_count, sample_count))
+    timestamps = np.empty((trigger_count, sample_count), dtype=np.int64)
+    trigger_timestamps = np.empty(trigger_count, dtype=np.int64)
+
+    def read_segments(num_segments):
+        """
+        Read the signal segments acquired since the last read() into the
+        preallocated arrays and return the total number of segments read.
+        """
+        # Read the Data Acquisition's data, this command can also be executed before
+        # daq_module.finished() is True. In that case data recorded up to that point in
+        # time is returned and we need to issue read() again to fetch the rest of the data.
+        return_flat_data_dict = True
+        data = daq_module.read(return_flat_data_dict)
+        for segment in data.get(signal_path, []):
+            header = segment["header"]
+            # With repetitions > 1, read() also returns the grid that is still being
+            # averaged. It is returned again by a later read() once it's complete.
+            if not header["flags"][0] & _GRID_COMPLETE:
+                continue
+            values[num_segments] = segment["value"][0]
+            timestamps[num_segments] = segment["timestamp"][0]
+            # Align the triggers using their trigger timestamps which are stored in the chunk
+            # header "changed" timestamp. This is the timestamp of the last acquired trigger.
+            # Note that with the new software trigger, the trigger timestamp has the trigger
+            # offset added to it, so we need to subtract it to get the sample and trigger
+            # timestamps to align. The header fields are arrays with a single element.
+            trigger_timestamps[num_segments] = header["changedtimestamp"][0] - int(
+                header["gridcoloffset"][0] * clockbase
+            )
+            num_segments += 1
+        return num_segments
+
+    num_segments = 0
+
     # Start the Data Acquisition Module running.
     daq_module.execute()
     time.sleep(1.2 * buffer_size)
@@ -237,17 +282,17 @@ def run_example(
     # Generate some pulses on the signal outputs by changing the signal output
     # mixer's amplitude. This is for demonstration only and is not necessary to
     # configure the module, we simply generate a signal upon which we can trigger.
-    for _ in range(num_pulses * repetitions):
-        daq.setDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_low * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
-        daq.sync()
+    # Draw the random amplitude jitter of all pulses at once.
+    rng = np.random.default_rng()
+    jitter = rng.uniform(-1.0, 1.0, size=(num_pulses * repetitions, 2))
+    amplitudes_low = sigouts_low * (1 + 0.05 * jitter[:, 0])
+    amplitudes_high = sigouts_high * (1 + 0.05 * jitter[:, 1])
+    for i in range(num_pulses * repetitions):
+        # The 0.2 s low phase is far longer than the time the setting takes to
+        # propagate, only the rising edge below needs an explicit sync().
+        daq.setDouble(amplitude_path, float(amplitudes_low[i]))
         time.sleep(0.2)
-        daq.setDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_high * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
+        daq.setDouble(amplitude_path, float(amplitudes_high[i]))
         daq.sync()
         time.sleep(0.1)
         # Check and display the progress.
@@ -257,18 +302,20 @@ def run_example(
                 {progress[0]:.2%}.",
             end="\r",
         )
+        # Fetch the segments acquired so far. When saving, all segments are left in
+        # the module for the single save before the final read() below: Data that
+        # has been read is removed from the module and would be missing in the file.
+        if not save:
+            num_segments = read_segments(num_segments)
         # Check whether the Data Acquisition Module has finished.
         if daq_module.finished():
             print("\nTrigger is finished.")
             break
     print("")
-    daq.setDouble(
-        "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-        sigouts_low,
-    )
+    daq.setDouble(amplitude_path, sigouts_low)
 
     # Wait for the Data Acquisition's buffers to finish processing the triggers.
-    time.sleep(1.2 * buffer_size)
+    wait_finished(daq_module, timeout=1.2 * buffer_size)
 
     if save:
         # Indicate that the data should be saved to file.
@@ -276,43 +323,38 @@ def run_example(
         # Otherwise there is no longer any data to save.
         daq_module.set("save/save", save)
 
-    # Read the Data Acquisition's data, this command can also be executed before
-    # daq_module.finished() is True. In that case data recorded up to that point in
-    # time is returned and we would still need to issue read() at the end to
-    # fetch the rest of the data.
-    return_flat_data_dict = True
-    data = daq_module.read(return_flat_data_dict)
+    # Fetch the remaining segments.
+    num_segments = read_segments(num_segments)
 
     if save:
         # Wait until the save is complete. The saving is done asynchronously in the background
-        # so we need to check it's finished before exiting.
-        save_done = daq_module.getInt("save/save")
-        while save_done != 0:
-            save_done = daq_module.getInt("save/save")
-
-    # Check that the dictionary returned is non-empty.
-    assert (
-        data
-    ), "read() returned an empty data dictionary, did you subscribe to any paths?"
-    # Note: data could be empty if no data arrived, e.g., if the demods were
+        # so we need to check it's finished before exiting. Poll with an increasing
+        # interval (10 ms up to 200 ms) rather than querying the module continuously.
+        timeout = 30
+        t0 = time.time()
+        poll_interval = 0.01
+        while daq_module.getInt("save/save") != 0:
+            if time.time() - t0 > timeout:
+                raise Exception(
+                    f"Timeout after {timeout} s before data save completed."
+                )
+            time.sleep(poll_interval)
+            poll_interval = min(2 * poll_interval, 0.2)
+
+    # Note: there could be no segments if no data arrived, e.g., if the demods were
     # disabled or had rate 0
     assert (
-        signal_path in data
-    ), f"no data recorded: data dictionary has no key `{signal_path}`."
-    samples = data[signal_path]
-    print(f"Data Acquisition's read() returned {len(samples)} signal segments.")
+        num_segments
+    ), f"no data recorded: read() returned no data for `{signal_path}`."
+    print(f"Data Acquisition's read() returned {num_segments} signal segments.")
     assert (
-        len(samples) == trigger_count
-    ), f"Unexpected number of signal segments returned: `{len(samples)}`. \
+        num_segments == trigger_count
+    ), f"Unexpected number of signal segments returned: `{num_segments}`. \
         Expected: `{trigger_count}`."
 
-    # Get the sampling rate of the device's ADCs, the device clockbase.
-    clockbase = float(daq.getInt("/%s/clockbase" % device))
     # Use the clockbase to calculate the duration of the first signal segment's
-    # demodulator data, the segments are accessed by indexing `samples`.
-    dt_seconds = (
-        samples[0]["timestamp"][0][-1] - samples[0]["timestamp"][0][0]
-    ) / clockbase
+    # demodulator data, the segments are accessed by indexing the preallocated arrays.
+    dt_seconds = (timestamps[0, -1] - timestamps[0, 0]) / clockbase
     print(
         f"The first signal segment contains {dt_seconds:.3f} seconds of demodulator data."
     )
@@ -324,7 +366,7 @@ def run_example(
             not match the expected duration.",
     )
 
-    if plot and samples:
+    if plot and num_segments:
 
         _, axis = plt.subplots()
 
@@ -357,20 +399,13 @@ def run_example(
             trigger_level, trigger_level - trigger_hysteresis, alpha=0.5, color="grey"
         )
         # Plot the signal segments returned by the Data Acquisition.
-        for sample in samples:
-            # Align the triggers using their trigger timestamps which are stored in the chunk
-            # header "changed" timestamp. This is the timestamp of the last acquired trigger.
-            # Note that with the new software trigger, the trigger timestamp has the trigger offset
-            # added to it, so we need to subtract it to get the sample and trigger timestamps to
-            # align.
-            trigger_ts = sample["header"]["changedtimestamp"] - int(
-                sample["header"]["gridcoloffset"] * clockbase
-            )
-            t = (sample["timestamp"] - float(trigger_ts)) / clockbase
-            axis.plot(t[0], sample["value"][0])
+        # Compute the time axes of all segments at once and plot them with a single
+        # call (one line per column).
+        t = (timestamps - trigger_timestamps[:, np.newaxis]) / clockbase
+        axis.plot(t.T, values.T)
         axis.grid()
         title = (
-            f"The Data Acquisition Module returned {len(samples)} segments of demodulator data\n"
+            f"The Data Acquisition Module returned {num_segments} segments of demodulator data\n"
             f"each with a duration of {trigger_duration:.3f} seconds"
         )
         axis.set_title(title)
@@ -383,6 +418,16 @@ def run_example(
         plt.show()
 
 
+def wait_finished(daq_module, timeout, poll_interval=0.02):
+    """
+    Wait until the Data Acquisition Module has finished or the timeout (in
+    seconds) has passed, whichever happens first.
+    """
+    start = time.monotonic()
+    while not daq_module.finished() and time.monotonic() - start < timeout:
+        time.sleep(poll_interval)
+
+
 if __name__ == "__main__":
     import sys
     from pathlib import Path
@@ -40,6 +40,11 @@ Options:
     -a --amplitude AMPLITUDE  The amplitude to set on the signal output. [default: 0.25]
     --no-plot                 Hide plot of the recorded data.
 
+Returns:
+    values       The FFT amplitudes of the signal segments (one row per segment).
+    filters      The demodulator filter compensation of the segments.
+    header_meta  A dictionary with the segments' `gridcoldelta` and `flags`.
+
 Raises:
     Exception     If the specified devices do not match the requirements.
     RuntimeError  If the devices is not "discoverable" from the API.
@@ -48,10 +53,16 @@ See the LabOne Programming Manual for further help:
 https://docs.zhinst.com/labone_programming_manual/
 """
 
+import math
 import time
 import numpy as np
 import zhinst.utils
-import matplotlib.pyplot as plt
+
+# Loop-invariant constants of the amplitude computations, as Python floats.
+_SQRT2 = math.sqrt(2.0)
+# Conversion factor from the natural logarithm of an amplitude to dB:
+# 20 * log10(x) = _DB_PER_LN * ln(x).
+_DB_PER_LN = 20.0 / math.log(10.0)
 
 
 def run_example(
@@ -91,25 +102,27 @@ def run_example(
     demod_rate = 10e3
     time_constant = 8e-5
     frequency = 400e3
+    # Build the node paths used repeatedly below only once.
+    sigin_path = f"/{device}/sigins/{in_channel}"
+    demod_path = f"/{device}/demods/{demod_index}"
+    sigout_path = f"/{device}/sigouts/{out_channel}"
+    amplitude_path = f"{sigout_path}/amplitudes/{out_mixer_channel}"
     exp_setting = [
-        ["/%s/sigins/%d/ac" % (device, in_channel), 0],
-        ["/%s/sigins/%d/imp50" % (device, in_channel), 0],
-        ["/%s/sigins/%d/range" % (device, in_channel), 3 * amplitude],
-        ["/%s/demods/%d/enable" % (device, demod_index), 1],
-        ["/%s/demods/%d/rate" % (device, demod_index), demod_rate],
-        ["/%s/demods/%d/adcselect" % (device, demod_index), in_channel],
-        ["/%s/demods/%d/order" % (device, demod_index), 4],
-        ["/%s/demods/%d/timeconstant" % (device, demod_index), time_constant],
-        ["/%s/demods/%d/oscselect" % (device, demod_index), osc_index],
-        ["/%s/demods/%d/harmonic" % (device, demod_index), 1],
-        ["/%s/oscs/%d/freq" % (device, osc_index), frequency],
-        ["/%s/sigouts/%d/on" % (device, out_channel), 1],
-        ["/%s/sigouts/%d/enables/%d" % (device, out_channel, out_mixer_channel), 1],
-        ["/%s/sigouts/%d/range" % (device, out_channel), 1],
-        [
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            amplitude,
-        ],
+        [f"{sigin_path}/ac", 0],
+        [f"{sigin_path}/imp50", 0],
+        [f"{sigin_path}/range", 3 * amplitude],
+        [f"{demod_path}/enable", 1],
+        [f"{demod_path}/rate", demod_rate],
+        [f"{demod_path}/adcselect", in_channel],
+        [f"{demod_path}/order", 4],
+        [f"{demod_path}/timeconstant", time_constant],
+        [f"{demod_path}/oscselect", osc_index],
+        [f"{demod_path}/harmonic", 1],
+        [f"/{device}/oscs/{osc_index}/freq", frequency],
+        [f"{sigout_path}/on", 1],
+        [f"{sigout_path}/enables/{out_mixer_channel}", 1],
+        [f"{sigout_path}/range", 1],
+        [amplitude_path, amplitude],
     ]
     daq.set(exp_setting)
 
@@ -132,22 +145,13 @@ def run_example(
     sigouts_low = 1.0 * amplitude
     num_pulses = 20
 
-    # Configure the Data Acquisition Module.
-    # Set the device that will be used for the trigger - this parameter must be set.
-    daq_module.set("device", device)
     # We will trigger on the demodulator sample's R value.
-    trigger_path = "/%s/demods/%d/sample.r" % (device, demod_index)
+    trigger_path = f"{demod_path}/sample.r"
     triggernode = trigger_path
-    daq_module.set("triggernode", triggernode)
-    # Use an edge trigger.
-    daq_module.set("type", 1)  # 1 = edge
-    # Trigger on the positive edge.
-    daq_module.set("edge", 1)  # 1 = positive
     # The set the trigger level.
     # Scale by 1/sqrt(2) due to the demodulator's R RMS value.
-    trigger_level = 0.5 * (sigouts_low + sigouts_high) / np.sqrt(2)
+    trigger_level = 0.5 * (sigouts_low + sigouts_high) / _SQRT2
     print(f"Setting 0/level to {trigger_level:.3f}.")
-    daq_module.set("level", trigger_level)
     # Set the trigger hysteresis to a percentage of the trigger level: This
     # ensures that triggering is robust in the presence of noise. The trigger
     # becomes armed when the signal passes through the hysteresis value and will
@@ -157,42 +161,57 @@ def run_example(
     # trigger).
     trigger_hysteresis = 0.05 * trigger_level
     print(f"Setting 0/hysteresis {trigger_hysteresis:.3f}.")
-    daq_module.set("hysteresis", trigger_hysteresis)
     # The number of times to trigger.
     trigger_count = int(num_pulses / 2)
-    daq_module.set("count", trigger_count)
-    daq_module.set("holdoff/count", 0)
-    daq_module.set("holdoff/time", 0.100)
     trigger_delay = -0.020
-    daq_module.set("delay", trigger_delay)
-    demod_rate = daq.getDouble("/%s/demods/%d/rate" % (device, demod_index))
-    # 'grid/mode' - Specify the interpolation method of
-    #   the returned data samples.
-    #
-    # 1 = Nearest. If the interval between samples on the grid does not match
-    #     the interval between samples sent from the device exactly, the nearest
-    #     sample (in time) is taken.
-    #
-    # 2 = Linear interpolation. If the interval between samples on the grid does
-    #     not match the interval between samples sent from the device exactly,
-    #     linear interpolation is performed between the two neighbouring
-    #     samples.
-    #
-    # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
-    #     from the device) defines the interval between samples on the DAQ
-    #     Module's grid. If multiple signals are subscribed, these are
-    #     interpolated onto the grid (defined by the signal with the highest
-    #     rate, "highest_rate"). In this mode, duration is
-    #     read-only and is defined as num_cols/highest_rate.
-    daq_module.set("grid/mode", 4)
+    # The device may round the demodulator rate. We don't need to read it back: In
+    # exact grid mode the module adjusts the duration to the actual rate, which we
+    # read back from the module below.
     # For an FFT the number of samples needs to be a binary power
     # sample_count = int(demod_rate * trigger_duration)
     sample_count = 2048
     # The duration (the length of time to record each time we trigger) must fit exactly with
     # the number of samples. Otherwise in exact mode, it will be adjusted to fit.
     trigger_duration = sample_count / demod_rate
-    daq_module.set("duration", trigger_duration)
-    daq_module.set("grid/cols", sample_count)
+
+    # Configure the Data Acquisition Module with a single set() call.
+    daq_module_setting = [
+        # Set the device that will be used for the trigger - this parameter must be set.
+        ["device", device],
+        ["triggernode", triggernode],
+        # Use an edge trigger.
+        ["type", 1],  # 1 = edge
+        # Trigger on the positive edge.
+        ["edge", 1],  # 1 = positive
+        ["level", trigger_level],
+        ["hysteresis", trigger_hysteresis],
+        ["count", trigger_count],
+        ["holdoff/count", 0],
+        ["holdoff/time", 0.100],
+        ["delay", trigger_delay],
+        # 'grid/mode' - Specify the interpolation method of
+        #   the returned data samples.
+        #
+        # 1 = Nearest. If the interval between samples on the grid does not match
+        #     the interval between samples sent from the device exactly, the nearest
+        #     sample (in time) is taken.
+        #
+        # 2 = Linear interpolation. If the interval between samples on the grid does
+        #     not match the interval between samples sent from the device exactly,
+        #     linear interpolation is performed between the two neighbouring
+        #     samples.
+        #
+        # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
+        #     from the device) defines the interval between samples on the DAQ
+        #     Module's grid. If multiple signals are subscribed, these are
+        #     interpolated onto the grid (defined by the signal with the highest
+        #     rate, "highest_rate"). In this mode, duration is
+        #     read-only and is defined as num_cols/highest_rate.
+        ["grid/mode", 4],
+        ["duration", trigger_duration],
+        ["grid/cols", sample_count],
+    ]
+    daq_module.set(daq_module_setting)
     trigger_duration = daq_module.getDouble("duration")
     # The size of the internal buffer used to record triggers (in seconds), this
     # should be larger than trigger_duration.
@@ -203,14 +222,47 @@ def run_example(
     # This is done by appending the signal/operations to the basic node path using dot notation and
     # then subscribing to this path (signal).
     # We could additionally subscribe to other node paths.
-    signal_path = "/%s/demods/%d/sample.xiy.fft.abs" % (device, demod_index)
-    filter_compensations_path = "/%s/demods/%d/sample.xiy.fft.abs.filter" % (
-        device,
-        demod_index,
-    )
+    signal_path = f"{demod_path}/sample.xiy.fft.abs"
+    filter_compensations_path = f"{demod_path}/sample.xiy.fft.abs.filter"
     daq_module.subscribe(signal_path)
     daq_module.subscribe(filter_compensations_path)
 
+    # Preallocate the arrays the segments are read into: The memory needed is known
+    # up-front and does not grow while the module is read out. Single precision is
+    # plenty for a dB plot and halves the memory the computations need to touch.
+    values = np.empty((trigger_count, sample_count), dtype=np.float32)
+    filters = np.empty((trigger_count, sample_count), dtype=np.float32)
+    gridcoldelta = np.empty(trigger_count)
+    flags = np.empty(trigger_count, dtype=np.int64)
+
+    def read_segments(num_segments):
+        """
+        Read the FFT segments acquired since the last read() into the
+        preallocated arrays and return the total number of segments read.
+        """
+        # Read the Data Acquisition's data, this command can also be executed before
+        # daq_module.finished() is True. In that case data recorded up to that point in
+        # time is returned and we need to issue read() again to fetch the rest of the data.
+        return_flat_data_dict = True
+        data = daq_module.read(return_flat_data_dict)
+        # The signal and its filter compensation are returned for the same triggers.
+        samples = data.get(signal_path, [])
+        filter_compensations = data.get(filter_compensations_path, [])
+        assert len(samples) == len(
+            filter_compensations
+        ), f"read() returned {len(samples)} signal segments but \
+            {len(filter_compensations)} filter compensation segments."
+        for sample, filter_compensation in zip(samples, filter_compensations):
+            values[num_segments] = sample["value"][0]
+            filters[num_segments] = filter_compensation["value"][0]
+            # The header fields are arrays with a single element.
+            gridcoldelta[num_segments] = sample["header"]["gridcoldelta"][0]
+            flags[num_segments] = sample["header"]["flags"][0]
+            num_segments += 1
+        return num_segments
+
+    num_segments = 0
+
     # Start the Data Acquisition's thread.
     daq_module.execute()
     time.sleep(2 * buffer_size)
@@ -218,87 +270,101 @@ def run_example(
     # Generate some pulses on the signal outputs by changing the signal output
     # mixer's amplitude. This is for demonstration only and is not necessary to
     # configure the module, we simply generate a signal upon which we can trigger.
-    for _ in range(num_pulses):
-        daq.syncSetDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_low * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
+    # Draw the random amplitude jitter of all pulses at once.
+    rng = np.random.default_rng()
+    jitter = rng.uniform(-1.0, 1.0, size=(num_pulses, 2))
+    # No sync() is needed per pulse: The sleeps are far longer than the time the
+    # settings take to propagate, and the module triggers on the demodulator R
+    # measured on the device, independent of the API's synchronisation.
+    last_print = 0.0
+    last_progress = -1.0
+    for i in range(num_pulses):
+        daq.setDouble(amplitude_path, sigouts_low * (1 + 0.05 * float(jitter[i, 0])))
         time.sleep(0.2)
-        daq.syncSetDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_high * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
+        daq.setDouble(amplitude_path, sigouts_high * (1 + 0.05 * float(jitter[i, 1])))
         time.sleep(0.1)
-        # Check and display the progress.
-        progress = daq_module.progress()
-        print(
-            f"Data Acquisition Module progress (acquiring {trigger_count:d} triggers): \
-                {progress[0]:.2%}.",
-            end="\r",
-        )
+        # Check and display the progress, at most 4 times per second and only if
+        # it changed.
+        now = time.monotonic()
+        if now - last_print > 0.25:
+            progress = daq_module.progress()[0]
+            if progress != last_progress:
+                print(
+                    f"Data Acquisition Module progress (acquiring {trigger_count:d} triggers): \
+                    {progress:.2%}.",
+                    end="\r",
+                )
+                last_progress = progress
+            last_print = now
+        # Fetch the segments acquired so far.
+        num_segments = read_segments(num_segments)
         # Check whether the Data Acquisition Module has finished.
         if daq_module.finished():
             print("\nTrigger is finished.")
             break
     print("")
-    daq.setDouble(
-        "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-        sigouts_low,
-    )
+    daq.setDouble(amplitude_path, sigouts_low)
+    daq.sync()
 
     # Wait for the Data Acquisition's buffers to finish processing the triggers.
-    time.sleep(2 * buffer_size)
+    wait_finished(daq_module, timeout=2 * buffer_size)
 
-    # Read the Data Acquisition's data, this command can also be executed before
-    # daq_module.finished() is True. In that case data recorded up to that point in
-    # time is returned and we would still need to issue read() at the end to
-    # fetch the rest of the data.
-    return_flat_data_dict = True
-    data = daq_module.read(return_flat_data_dict)
+    # Fetch the remaining segments.
+    num_segments = read_segments(num_segments)
 
-    # Check that the dictionary returned is non-empty.
-    assert (
-        data
-    ), "read() returned an empty data dictionary, did you subscribe to any paths?"
-    # Note: data could be empty if no data arrived, e.g., if the demods were
+    # Note: there could be no segments if no data arrived, e.g., if the demods were
     # disabled or had rate 0
     assert (
-        signal_path in data
-    ), f"no data recorded: data dictionary has no key `{signal_path}`."
-    samples = data[signal_path]
-    filter_compensations = data[filter_compensations_path]
-    print(f"Data Acquisition's read() returned {len(samples)} signal segments.")
+        num_segments
+    ), f"no data recorded: read() returned no data for `{signal_path}`."
+    print(f"Data Acquisition's read() returned {num_segments} signal segments.")
     assert (
-        len(samples) == trigger_count
-    ), f"Unexpected number of signal segments returned: `{len(samples)}`. \
+        num_segments == trigger_count
+    ), f"Unexpected number of signal segments returned: `{num_segments}`. \
         Expected: `{trigger_count}`."
 
-    if plot and samples:
+    header_meta = {"gridcoldelta": gridcoldelta, "flags": flags}
+
+    if plot:
+        # Only import Matplotlib and compute the dB spectra if we plot.
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
 
         _, axs = plt.subplots(2)
-        # Plot the FFT bins returned by the Data Acquisition.
-        for index, sample in enumerate(samples):
-            filter_compensation = filter_compensations[index]
-            bin_count = len(sample["value"][0])
-            bin_resolution = sample["header"]["gridcoldelta"]
-            frequencies = np.arange(bin_count)
-            # Center frequency and bandwidth not yet implemented.
-            # So we calculate from the gridcoldelta.
-            bandwidth = bin_resolution * len(frequencies)
-            frequencies = (
-                frequencies * bin_resolution - bandwidth / 2.0 + bin_resolution / 2.0
-            )
-            amplitude_db = 20 * np.log10(sample["value"][0] * np.sqrt(2) / amplitude)
-            amplitude_db_compensated = 20 * np.log10(
-                (sample["value"][0] / filter_compensation["value"][0])
-                * np.sqrt(2)
-                / amplitude
-            )
-            axs[0].plot(frequencies, amplitude_db)
-            axs[1].plot(frequencies, amplitude_db_compensated)
+        bin_count = values.shape[1]
+        # The bin resolution is the same for all segments.
+        bin_resolution = float(header_meta["gridcoldelta"][0])
+        # Center frequency and bandwidth not yet implemented.
+        # So we calculate from the gridcoldelta.
+        frequencies = (
+            np.arange(bin_count, dtype=np.float32) - bin_count / 2.0 + 0.5
+        ) * bin_resolution
+        # 20 * log10(x * sqrt(2) / amplitude) = _DB_PER_LN * (ln(x) + log_scale), which
+        # lets us take the logarithm of the values only once for both spectra. The
+        # constants are Python floats, so that they do not promote the arrays to
+        # double precision.
+        # The results are computed in place to avoid temporary arrays.
+        log_scale = math.log(_SQRT2 / amplitude)
+        amplitude_db = np.log(values)
+        amplitude_db += log_scale
+        amplitude_db_compensated = np.log(filters)
+        np.subtract(
+            amplitude_db, amplitude_db_compensated, out=amplitude_db_compensated
+        )
+        amplitude_db *= _DB_PER_LN
+        amplitude_db_compensated *= _DB_PER_LN
+        # Plot the FFT bins returned by the Data Acquisition, one line per segment.
+        # A LineCollection draws all segments as a single artist.
+        colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        for axis, amplitudes in zip(axs, (amplitude_db, amplitude_db_compensated)):
+            lines = np.empty(amplitudes.shape + (2,), dtype=amplitudes.dtype)
+            lines[..., 0] = frequencies
+            lines[..., 1] = amplitudes
+            axis.add_collection(LineCollection(lines, colors=colors))
+            axis.autoscale_view()
         axs[0].grid()
-        title = f"Data Acquisition's read() returned {len(samples)} FFTs each with \
-            {len(samples[0]['value'][0])} bins"
+        title = f"Data Acquisition's read() returned {num_segments} FFTs each with \
+            {bin_count} bins"
         axs[0].set_title(title)
         axs[0].set_xlabel("Frequency ($Hz$)")
         axs[0].set_ylabel("Amplitude R ($dBV$)")
@@ -310,6 +376,18 @@ def run_example(
 
         plt.show()
 
+    return values, filters, header_meta
+
+
+def wait_finished(daq_module, timeout, poll_interval=0.02):
+    """
+    Wait until the Data Acquisition Module has finished or the timeout (in
+    seconds) has passed, whichever happens first.
+    """
+    start = time.monotonic()
+    while not daq_module.finished() and time.monotonic() - start < timeout:
+        time.sleep(poll_interval)
+
 
 if __name__ == "__main__":
     import sys
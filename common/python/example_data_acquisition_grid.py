@@ -48,6 +48,9 @@ Options:
                               it requires minor tweaking) [default = False]
     -a --amplitude AMPLITUDE  The amplitude to set on the signal output. [default: 0.25]
     -r --num_grids NUM        The number of grids to record. [default: 3]
+    -d --directory DIR        If specified, write every finished grid to a .npy file in
+                              this directory instead of keeping it in memory.
+                              [default: None]
     --no-plot                 Hide plot of the recorded data.
 
 Raises:
@@ -58,10 +61,16 @@ See the LabOne Programming Manual for further help:
 https://docs.zhinst.com/labone_programming_manual/
 """
 
+import os
+import queue
+import threading
 import time
 import numpy as np
 import zhinst.utils
-import matplotlib.pyplot as plt
+
+# The first bit of a grid's header flags is set to 1 when the grid is complete and
+# the configured number of repetitions have completed.
+_GRID_COMPLETE = 0x1
 
 
 def run_example(
@@ -72,6 +81,7 @@ def run_example(
     amplitude: float = 0.25,
     num_grids: int = 3,
     plot: bool = True,
+    directory: str = None,
 ):
     """run the example."""
 
@@ -108,32 +118,31 @@ def run_example(
     demod_bandwidth = 10e3
     timeconstant = zhinst.utils.bw2tc(demod_bandwidth, demod_order)
     frequency = 400e3
+    # Build the node paths used repeatedly below only once.
+    sigin_path = f"/{device}/sigins/{in_channel}"
+    demod_path = f"/{device}/demods/{trigger_demod_index}"
+    sigout_path = f"/{device}/sigouts/{out_channel}"
     exp_setting = [
-        ["/%s/sigins/%d/ac" % (device, in_channel), 0],
-        ["/%s/sigins/%d/imp50" % (device, in_channel), 1],
-        ["/%s/sigins/%d/range" % (device, in_channel), 2 * amplitude],
-        ["/%s/demods/%d/enable" % (device, trigger_demod_index), 1],
-        ["/%s/demods/%d/rate" % (device, trigger_demod_index), demod_rate],
-        ["/%s/demods/%d/adcselect" % (device, trigger_demod_index), in_channel],
-        ["/%s/demods/%d/order" % (device, trigger_demod_index), demod_order],
-        ["/%s/demods/%d/timeconstant" % (device, trigger_demod_index), timeconstant],
-        ["/%s/demods/%d/oscselect" % (device, trigger_demod_index), osc_index],
-        ["/%s/demods/%d/harmonic" % (device, trigger_demod_index), 1],
-        ["/%s/oscs/%d/freq" % (device, osc_index), frequency],
-        ["/%s/sigouts/%d/on" % (device, out_channel), 1],
-        ["/%s/sigouts/%d/enables/%d" % (device, out_channel, out_mixer_channel), 1],
-        ["/%s/sigouts/%d/range" % (device, out_channel), 1],
-        [
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            amplitude,
-        ],
+        [f"{sigin_path}/ac", 0],
+        [f"{sigin_path}/imp50", 1],
+        [f"{sigin_path}/range", 2 * amplitude],
+        [f"{demod_path}/enable", 1],
+        [f"{demod_path}/rate", demod_rate],
+        [f"{demod_path}/adcselect", in_channel],
+        [f"{demod_path}/order", demod_order],
+        [f"{demod_path}/timeconstant", timeconstant],
+        [f"{demod_path}/oscselect", osc_index],
+        [f"{demod_path}/harmonic", 1],
+        [f"/{device}/oscs/{osc_index}/freq", frequency],
+        [f"{sigout_path}/on", 1],
+        [f"{sigout_path}/enables/{out_mixer_channel}", 1],
+        [f"{sigout_path}/range", 1],
+        [f"{sigout_path}/amplitudes/{out_mixer_channel}", amplitude],
     ]
     daq.set(exp_setting)
 
     # Wait for the demodulator filter to settle.
-    timeconstant_set = daq.getDouble(
-        "/%s/demods/%d/timeconstant" % (device, trigger_demod_index)
-    )
+    timeconstant_set = daq.getDouble(f"{demod_path}/timeconstant")
     time.sleep(10 * timeconstant_set)
 
     # Perform a global synchronisation between the device and the data server:
@@ -145,168 +154,168 @@ def run_example(
     # Create an instance of the Data Acquisition Module.
     daq_module = daq.dataAcquisitionModule()
 
-    # Set the device that will be used for the trigger - this parameter must be set.
-    daq_module.set("device", device)
-    # We will trigger on a positive edge of a demodulator sample R value.
-    # type (int):
-    #   NO_TRIGGER = 0
-    #   EDGE_TRIGGER = 1
-    #   DIGITAL_TRIGGER = 2
-    #   PULSE_TRIGGER = 3
-    #   TRACKING_TRIGGER = 4
-    #   HW_TRIGGER = 6
-    #   TRACKING_PULSE_TRIGGER = 7
-    #   EVENT_COUNT_TRIGGER = 8
-    daq_module.set("type", 1)
-    # triggernode (char):
-    #   Specify the trigger signal to trigger on. The trigger signal comprises
-    #   of a device node path appended with a trigger field seperated by a dot.
-    #   For demodulator samples, the following trigger fields are available:
-    #   SAMPLE.X = Demodulator X value
-    #   SAMPLE.Y = Demodulator Y value
-    #   SAMPLE.R = Demodulator Magnitude
-    #   SAMPLE.THETA = Demodulator Phase
-    #   SAMPLE.AUXIN0 = Auxilliary input 1 value
-    #   SAMPLE.AUXIN1 = Auxilliary input 2 value
-    #   SAMPLE.DIO = Digital I/O value
-    #   SAMPLE.TRIGINN = HW Trigger In N (where supported)
-    #   SAMPLE.TRIGOUTN = HW Trigger Out N (where supported)
-    #   SAMPLE.TRIGDEMOD1PHASE = Demod 1's oscillator's phase (MF, UHF)
-    #   SAMPLE.TRIGDEMOD2PHASE = Demod 2's oscillator's phase (MF)
-    #   SAMPLE.TRIGDEMOD4PHASE = Demod 4's oscillator's phase  (UHF)
-    #   SAMPLE.TRIGAWGTRIGN = AWG Trigger N  (where supported)
-    triggerpath = "/%s/demods/%d/sample.r" % (device, trigger_demod_index)
+    # We will trigger on the demodulator sample's R value.
+    triggerpath = f"{demod_path}/sample.r"
     triggernode = triggerpath
-    daq_module.set("triggernode", triggernode)
-    # edge (int):
-    #   Specify which edge type to trigger on.
-    #   POS_EDGE = 1
-    #   NEG_EDGE = 2
-    #   BOTH_EDGE = 3
-    daq_module.set("edge", 1)
-    # Note: We do not manually set level and hysteresis in
-    # this example, rather we set the findlevel parameter to 1 and let
-    # the Data Acquisition Module determine an appropriate level and hysteresis for us.
-    #
-    # level (double):
-    # The set the trigger level.
-    # trigger_level = 0.70
-    # daq_module.set('level', trigger_level)
-    #
-    # hysteresis (double):
-    #   The hysterisis is effectively a second criteria (if non-zero) for
-    #   triggering and makes triggering more robust in noisy signals. When the
-    #   trigger `level` is violated, then the signal must return beneath (for
-    #   positive trigger edge) the hysteresis value in order to trigger.
-    #
-    # The size of the internal buffer used to store data, this should be larger
-    # than trigger_duration.
-    trigger_duration = 0.010
     # The length of time to record the data for each time we trigger.
-    daq_module.set("duration", trigger_duration)
+    trigger_duration = 0.010
     trigger_delay = -0.25 * trigger_duration
-    daq_module.set("delay", trigger_delay)
-    # Do not return overlapped trigger events.
-    daq_module.set("holdoff/time", trigger_duration)
-    daq_module.set("holdoff/count", 0)
-
-    # Unrequired parameters when type is EDGE_TRIGGER:
-    # daq_module.set('bitmask', 1)  % For DIGITAL_TRIGGER
-    # daq_module.set('bits', 1)  % For DIGITAL_TRIGGER
-    # daq_module.set('bandwidth', 10)  % For TRACKING_TRIGGER
-
-    # 'grid/mode' - Specify the interpolation method of
-    #   the returned data samples.
-    #
-    # 1 = Nearest. If the interval between samples on the grid does not match
-    #     the interval between samples sent from the device exactly, the nearest
-    #     sample (in time) is taken.
-    #
-    # 2 = Linear interpolation. If the interval between samples on the grid does
-    #     not match the interval between samples sent from the device exactly,
-    #     linear interpolation is performed between the two neighbouring
-    #     samples.
-    #
-    # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
-    #     from the device) defines the interval between samples on the DAQ
-    #     Module's grid. If multiple signals are subscribed, these are
-    #     interpolated onto the grid (defined by the signal with the highest
-    #     rate, "highest_rate"). In this mode, duration is
-    #     read-only and is defined as num_cols/highest_rate.
-    daq_module.set("grid/mode", 2)
-    # grid/repetitions (int)
-    #   The number of times to average.
-    daq_module.set("grid/repetitions", 1)
-    # grid/cols (int)
-    #   Specify the number of columns in the grid's matrix. The data from each
-    #     row is interpolated onto a grid with the specified number of columns.
+    # The number of columns and rows in the grid's matrix.
     num_cols = 500
-    daq_module.set("grid/cols", num_cols)
-    # grid/rows (int)
-    #   Specify the number of rows in the grid's matrix. Each row is the data
-    #   recorded from one trigger.
     num_rows = 500
-    daq_module.set("grid/rows", 500)
-    # grid/direction (int)
-    #   Specify the ordering of the data stored in the grid's matrix.
-    #     0: Forward - the data in each row is ordered chronologically, e.g., the
-    #       first data point in each row corresponds to the first timestamp in the
-    #       trigger data.
-    #     1: Reverse - the data in each row is ordered reverse chronologically,
-    #       e.g., the first data point in each row corresponds to the last
-    #       timestamp in the trigger data.
-    #     2: Bidirectional - the ordering of the data alternates between Forward
-    #        and Backward ordering from row-to-row. The first row is Forward ordered.
-    daq_module.set("grid/direction", 0)
-
-    # The number of grids to record (if not running in endless mode).
-    # In grid mode, we will obtain count grids. The total
-    # number of triggers is equal to n = count *
-    # grid/rows * grid/repetitions
-    daq_module.set("count", num_grids)
+
+    # Configure the Data Acquisition Module with a single set() call.
+    daq_module_setting = [
+        # Set the device that will be used for the trigger - this parameter must be set.
+        ["device", device],
+        # We will trigger on a positive edge of a demodulator sample R value.
+        # type (int):
+        #   NO_TRIGGER = 0
+        #   EDGE_TRIGGER = 1
+        #   DIGITAL_TRIGGER = 2
+        #   PULSE_TRIGGER = 3
+        #   TRACKING_TRIGGER = 4
+        #   HW_TRIGGER = 6
+        #   TRACKING_PULSE_TRIGGER = 7
+        #   EVENT_COUNT_TRIGGER = 8
+        ["type", 1],
+        # triggernode (char):
+        #   Specify the trigger signal to trigger on. The trigger signal comprises
+        #   of a device node path appended with a trigger field seperated by a dot.
+        #   For demodulator samples, the following trigger fields are available:
+        #   SAMPLE.X = Demodulator X value
+        #   SAMPLE.Y = Demodulator Y value
+        #   SAMPLE.R = Demodulator Magnitude
+        #   SAMPLE.THETA = Demodulator Phase
+        #   SAMPLE.AUXIN0 = Auxilliary input 1 value
+        #   SAMPLE.AUXIN1 = Auxilliary input 2 value
+        #   SAMPLE.DIO = Digital I/O value
+        #   SAMPLE.TRIGINN = HW Trigger In N (where supported)
+        #   SAMPLE.TRIGOUTN = HW Trigger Out N (where supported)
+        #   SAMPLE.TRIGDEMOD1PHASE = Demod 1's oscillator's phase (MF, UHF)
+        #   SAMPLE.TRIGDEMOD2PHASE = Demod 2's oscillator's phase (MF)
+        #   SAMPLE.TRIGDEMOD4PHASE = Demod 4's oscillator's phase  (UHF)
+        #   SAMPLE.TRIGAWGTRIGN = AWG Trigger N  (where supported)
+        ["triggernode", triggernode],
+        # edge (int):
+        #   Specify which edge type to trigger on.
+        #   POS_EDGE = 1
+        #   NEG_EDGE = 2
+        #   BOTH_EDGE = 3
+        ["edge", 1],
+        # Note: We do not manually set level and hysteresis in
+        # this example, rather we set the findlevel parameter to 1 and let
+        # the Data Acquisition Module determine an appropriate level and hysteresis for us.
+        #
+        # level (double):
+        # The set the trigger level.
+        # ["level", 0.70],
+        #
+        # hysteresis (double):
+        #   The hysterisis is effectively a second criteria (if non-zero) for
+        #   triggering and makes triggering more robust in noisy signals. When the
+        #   trigger `level` is violated, then the signal must return beneath (for
+        #   positive trigger edge) the hysteresis value in order to trigger.
+        #
+        # The length of time to record the data for each time we trigger.
+        ["duration", trigger_duration],
+        ["delay", trigger_delay],
+        # Do not return overlapped trigger events.
+        ["holdoff/time", trigger_duration],
+        ["holdoff/count", 0],
+        # Unrequired parameters when type is EDGE_TRIGGER:
+        # ["bitmask", 1],  # For DIGITAL_TRIGGER
+        # ["bits", 1],  # For DIGITAL_TRIGGER
+        # ["bandwidth", 10],  # For TRACKING_TRIGGER
+        #
+        # 'grid/mode' - Specify the interpolation method of
+        #   the returned data samples.
+        #
+        # 1 = Nearest. If the interval between samples on the grid does not match
+        #     the interval between samples sent from the device exactly, the nearest
+        #     sample (in time) is taken.
+        #
+        # 2 = Linear interpolation. If the interval between samples on the grid does
+        #     not match the interval between samples sent from the device exactly,
+        #     linear interpolation is performed between the two neighbouring
+        #     samples.
+        #
+        # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
+        #     from the device) defines the interval between samples on the DAQ
+        #     Module's grid. If multiple signals are subscribed, these are
+        #     interpolated onto the grid (defined by the signal with the highest
+        #     rate, "highest_rate"). In this mode, duration is
+        #     read-only and is defined as num_cols/highest_rate.
+        ["grid/mode", 2],
+        # grid/repetitions (int)
+        #   The number of times to average.
+        ["grid/repetitions", 1],
+        # grid/cols (int)
+        #   Specify the number of columns in the grid's matrix. The data from each
+        #     row is interpolated onto a grid with the specified number of columns.
+        ["grid/cols", num_cols],
+        # grid/rows (int)
+        #   Specify the number of rows in the grid's matrix. Each row is the data
+        #   recorded from one trigger.
+        ["grid/rows", num_rows],
+        # grid/direction (int)
+        #   Specify the ordering of the data stored in the grid's matrix.
+        #     0: Forward - the data in each row is ordered chronologically, e.g., the
+        #       first data point in each row corresponds to the first timestamp in the
+        #       trigger data.
+        #     1: Reverse - the data in each row is ordered reverse chronologically,
+        #       e.g., the first data point in each row corresponds to the last
+        #       timestamp in the trigger data.
+        #     2: Bidirectional - the ordering of the data alternates between Forward
+        #        and Backward ordering from row-to-row. The first row is Forward ordered.
+        ["grid/direction", 0],
+        # The number of grids to record (if not running in endless mode).
+        # In grid mode, we will obtain count grids. The total
+        # number of triggers is equal to n = count *
+        # grid/rows * grid/repetitions
+        ["count", num_grids],
+    ]
+    daq_module.set(daq_module_setting)
 
     # We will perform intermediate reads from the module. When a grid is
     # complete and read() is called, the data is removed from the module. We
     # have to manage saving of the finished grid ourselves if we perform
-    # intermediate reads.
+    # intermediate reads. At most num_grids grids are recorded, so the lists are
+    # allocated up-front and the finished grids are stored by index.
     data = {}
-    data[triggerpath] = []
+    data[triggerpath] = [] if directory else [None] * num_grids
 
     # Subscribe to the device node paths we would like to record when the trigger criteria is met.
-    pid_error_stream_path = "/%s/pids/0/stream/error" % device
+    pid_error_stream_path = f"/{device}/pids/0/stream/error"
     node_paths = daq.listNodes(pid_error_stream_path, 7)
     # If this node is present, then the instrument has the PID Option. In this
     # case additionally subscribe to a PID's error. Note, PID streaming nodes
     # not available on HF2 instruments.
     if pid_error_stream_path.lower() in node_paths:
         daq_module.subscribe(pid_error_stream_path)
-        daq.setDouble("/%s/pids/0/stream/rate" % device, 30e3)
-        data[pid_error_stream_path] = []
+        daq.setDouble(f"/{device}/pids/0/stream/rate", 30e3)
+        data[pid_error_stream_path] = [] if directory else [None] * num_grids
     # Note: We subscribe to the trigger signal path last to ensure that we obtain
     # complete data on the other paths (known limitation). We must subscribe to
     # the trigger signal path.
     daq_module.subscribe(triggerpath)
 
     if plot:
+        # Only import Matplotlib (and initialize a GUI backend) if we plot.
+        import matplotlib.pyplot as plt
+
         fig, axis = plt.subplots()
         # Initialize the image plot with NANs - we'll only update the img's data
         # in the loop.
-        img = np.empty(
-            (
-                num_rows,
-                num_cols,
-            )
-        )
-        img[:] = np.nan
-        img = axis.imshow(img, cmap="Blues")
+        img = np.full((num_rows, num_cols), np.nan, dtype=np.float32)
+        # The image is animated, i.e. only drawn explicitly by update_plot().
+        img = axis.imshow(img, cmap="Blues", animated=True)
         num_ticks = 5
         ticks = np.linspace(0, num_cols, num_ticks)
-        ticklabels = [
-            f"{trigger_delay + trigger_duration * tick / num_cols:0.3f}"
-            for tick in ticks
-        ]
+        # Compute the times of all ticks at once and format them in one call.
+        tick_times = trigger_delay + trigger_duration * ticks / num_cols
         axis.set_xticks(ticks)
-        axis.set_xticklabels(ticklabels)
+        axis.set_xticklabels(np.char.mod("%0.3f", tick_times))
         colorbar = fig.colorbar(img)
         colorbar.formatter.set_useOffset(False)
         colorbar.update_ticks()
@@ -314,6 +323,68 @@ def run_example(
         axis.set_xlabel("Time, relative to trigger ($s$)")
         axis.set_ylabel("Grid row index")
         plt.ion()
+        # Show the window now, the updates below do not go through plt.pause().
+        plt.show(block=False)
+        # Render the figure once and cache the axis as background for blitting:
+        # Subsequent updates only draw the image on top of the cached background
+        # instead of redrawing the whole figure.
+        fig.canvas.draw()
+        background = fig.canvas.copy_from_bbox(axis.bbox)
+        # The range of the values plotted so far, the color scale only grows.
+        value_min = np.inf
+        value_max = -np.inf
+
+    def update_plot(grid):
+        """
+        Draw the image of the grid by blitting. The whole figure is only rendered
+        again if the color scale changed.
+        """
+        nonlocal background, value_min, value_max
+        # set_data() copies the grid itself, the grids are already single precision
+        # (see grids_to_float32()), so there is no need to copy them to a buffer first.
+        img.set_data(grid)
+        # Rows not recorded yet are NaN.
+        grid_min = float(np.nanmin(grid))
+        grid_max = float(np.nanmax(grid))
+        if grid_min < value_min or grid_max > value_max:
+            value_min = min(value_min, grid_min)
+            value_max = max(value_max, grid_max)
+            img.set_clim(value_min, value_max)
+            # The colorbar needs to be updated to the new color scale.
+            fig.canvas.draw()
+            background = fig.canvas.copy_from_bbox(axis.bbox)
+        fig.canvas.restore_region(background)
+        axis.draw_artist(img)
+        fig.canvas.blit(axis.bbox)
+        fig.canvas.flush_events()
+
+    if directory:
+        # Write the finished grids to file in a background thread, so that the file
+        # I/O does not delay the acquisition loop and the grids do not accumulate in
+        # memory. The thread is a daemon so that it does not keep the example alive
+        # if the acquisition fails.
+        os.makedirs(directory, exist_ok=True)
+        write_queue = queue.Queue(maxsize=16)
+
+        def write_grids():
+            """Write the grids put into the queue to file until None is received."""
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    return
+                path, grid_index, values = item
+                filename = f"{path.strip('/').replace('/', '_')}_{grid_index}.npy"
+                np.save(os.path.join(directory, filename), values)
+
+        writer = threading.Thread(target=write_grids, daemon=True)
+        writer.start()
+
+    def store_grid(path, grid_index, grid):
+        """Keep a finished grid in `data` or pass it on to be written to file."""
+        if directory:
+            write_queue.put((path, grid_index, grid["value"]))
+        else:
+            data[path][grid_index] = grid
 
     # Arm the Data Acquisition Module: ready for trigger acquisition.
     daq_module.execute()
@@ -322,8 +393,12 @@ def run_example(
     findlevel = 1
     timeout = 10  # [s]
     t0 = time.time()
+    # Poll with an increasing interval (1 ms up to 20 ms) rather than querying the
+    # module at a fixed rate.
+    poll_interval = 0.001
     while findlevel == 1:
-        time.sleep(0.05)
+        time.sleep(poll_interval)
+        poll_interval = min(2 * poll_interval, 0.02)
         findlevel = daq_module.getInt("findlevel")
         if time.time() - t0 > timeout:
             daq_module.finish()
@@ -331,54 +406,74 @@ def run_example(
                 "Data Acquisition Module didn't find trigger level after %.3f seconds."
                 % timeout
             )
-    level = daq_module.getDouble("level")
-    hysteresis = daq_module.getDouble("hysteresis")
+    # Get the level and hysteresis the module found with a single get() call.
+    result = daq_module.get("*", True)
+    level = result["/level"][0]
+    hysteresis = result["/hysteresis"][0]
     print(
         f"Data Acquisition Module found and set level: {level},",
         f"hysteresis: {hysteresis}.",
     )
 
-    flags = 0
+    # Whether the last grid returned by read() was complete.
+    last_grid_complete = False
     return_flat_data_dict = True
     num_finished_grids = 0
     timeout = 120  # [s]
+    # Check whether the module has finished with an adaptive interval: Start with a
+    # short interval and back off exponentially, up to the trigger duration, while
+    # no new data arrives. This detects the end of the acquisition quickly without
+    # waking up needlessly. Reading out the (partially filled) grid is more
+    # expensive, so we only do that every read_interval seconds.
+    poll_interval_min = 0.001
+    poll_interval = poll_interval_min
+    read_interval = 0.05
     t0 = time.time()
+    t_read = t0
     while not daq_module.finished():
-        # Read out the intermediate data captured by the Data Acquisition Module.
-        data_read = daq_module.read(return_flat_data_dict)
-        if (triggerpath in data_read) and data_read[triggerpath]:
-            # Note, if 'count' > 1 then more than one grid could be returned.
-            num_grids_read = len(data_read[triggerpath])
-            for i in range(num_grids_read):
-                flags = data_read[triggerpath][i]["header"]["flags"]
-                if flags & 1:
-                    # The first bit of flags is set to 1 when the grid is complete and the
-                    # configured number of repetitions have completed.
-                    num_finished_grids = num_finished_grids + 1
-                    print(f"Finished grid {num_finished_grids} of {num_grids}.")
-                    data[triggerpath].append(data_read[triggerpath][i])
-                    if pid_error_stream_path in data_read:
-                        # We only get PID data if the (non-HF2) device has the PID Option.
-                        data[pid_error_stream_path].append(
-                            data_read[pid_error_stream_path][i]
-                        )
-            print(
-                f"Overall progress: {daq_module.progress()[0]}. \
-                     Grid {num_finished_grids} flags: {flags[0]}."
-            )
-            if plot:
-                # Visualize the last grid's demodulator data (the demodulator used as
-                # the trigger path) from the intermediate read(). Plot the updated
-                # grid.
-                img.set_data(data_read[triggerpath][-1]["value"])
-                img.autoscale()
-        else:
-            print("No update available since last read.")
+        # Query the time only once per iteration.
+        now = time.time()
+        if now - t_read >= read_interval:
+            t_read = now
+            # Read out the intermediate data captured by the Data Acquisition Module.
+            data_read = grids_to_float32(daq_module.read(return_flat_data_dict))
+            grids_read = data_read.get(triggerpath)
+            if grids_read:
+                # We only get PID data if the (non-HF2) device has the PID Option.
+                pid_grids_read = data_read.get(pid_error_stream_path)
+                # Note, if 'count' > 1 then more than one grid could be returned.
+                for i, grid in enumerate(grids_read):
+                    flags = grid["header"]["flags"]
+                    last_grid_complete = bool(flags & _GRID_COMPLETE)
+                    if last_grid_complete:
+                        grid_index = num_finished_grids
+                        num_finished_grids = num_finished_grids + 1
+                        print(f"Finished grid {num_finished_grids} of {num_grids}.")
+                        store_grid(triggerpath, grid_index, grid)
+                        if pid_grids_read:
+                            store_grid(
+                                pid_error_stream_path, grid_index, pid_grids_read[i]
+                            )
+                print(
+                    f"Overall progress: {daq_module.progress()[0]}. \
+                        Grid {num_finished_grids} flags: {flags[0]}."
+                )
+                if plot:
+                    # Visualize the last grid's demodulator data (the demodulator used
+                    # as the trigger path) from the intermediate read(). Plot the
+                    # updated grid.
+                    update_plot(grids_read[-1]["value"])
+                # New data arrived, check again soon.
+                poll_interval = poll_interval_min
+            else:
+                print("No update available since last read.")
         if plot:
-            plt.pause(0.01)
-        else:
-            time.sleep(0.05)
-        if time.time() - t0 > timeout:
+            # Only process the GUI events here: plt.pause() would redraw the whole
+            # figure whenever it is stale, the image is drawn by update_plot().
+            fig.canvas.flush_events()
+        time.sleep(poll_interval)
+        poll_interval = min(2 * poll_interval, trigger_duration)
+        if now - t0 > timeout:
             # Leave the loop if we're not obtaining triggers/grids quickly enough.
             if num_finished_grids == 0:
                 # If we didn't even get one grid, stop the module, delete its
@@ -393,33 +488,44 @@ def run_example(
             )
             break
 
-    if not flags & 1:
+    if not last_grid_complete:
         # The Data Acquisition Module finished recording since performing the previous intermediate
         # read() in the loop: Do another read() to get the final data.
         print(
             "Data Acquisition Module finished since last intermediate read() in loop, \
                 reading out finished grid(s)."
         )
-        data_read = daq_module.read(return_flat_data_dict)
-        num_grids_read = len(data_read[triggerpath])
-        for i in range(num_grids_read):
-            flags = data_read[triggerpath][i]["header"]["flags"]
-            if flags & 1:
-                data[triggerpath].append(data_read[triggerpath][i])
-                if pid_error_stream_path in data_read:
-                    # We only get PID data if the (non-HF2) device has the PID Option.
-                    data[pid_error_stream_path].append(
-                        data_read[pid_error_stream_path][i]
+        data_read = grids_to_float32(daq_module.read(return_flat_data_dict))
+        grids_read = data_read.get(triggerpath, [])
+        # We only get PID data if the (non-HF2) device has the PID Option.
+        pid_grids_read = data_read.get(pid_error_stream_path)
+        for i, grid in enumerate(grids_read):
+            if grid["header"]["flags"] & _GRID_COMPLETE:
+                store_grid(triggerpath, num_finished_grids, grid)
+                if pid_grids_read:
+                    store_grid(
+                        pid_error_stream_path, num_finished_grids, pid_grids_read[i]
                     )
-            if plot:
-                img.set_data(data_read[triggerpath][-1]["value"])
-                img.autoscale()
-                fig.canvas.draw()
+                num_finished_grids = num_finished_grids + 1
+        if plot and grids_read:
+            # Only the last grid is visible, so draw it once after the loop.
+            update_plot(grids_read[-1]["value"])
 
     # Stop the Module (this is also ok if daq_module.finished() is True).
     daq_module.finish()
 
+    if directory:
+        # Wait until all grids are written to file.
+        write_queue.put(None)
+        writer.join()
+
+    # Drop the slots of grids that were not recorded, e.g., due to the timeout.
+    for grids in data.values():
+        del grids[num_finished_grids:]
+
     if plot:
+        # Include the image in the figure's regular drawing again.
+        img.set_animated(False)
         plt.ioff()
         print("Please close the figure to exit the example...")
         plt.show()
@@ -427,6 +533,18 @@ def run_example(
     assert triggerpath in data, f"Ooops, we didn't get any data for `{triggerpath}`."
 
 
+def grids_to_float32(data_read):
+    """
+    Convert the values of the grids returned by read() to single precision, which
+    is plenty for the demodulator data and halves the memory that the grids kept,
+    plotted or written to file occupy. Return the data dictionary.
+    """
+    for grids in data_read.values():
+        for grid in grids:
+            grid["value"] = grid["value"].astype(np.float32, copy=False)
+    return data_read
+
+
 if __name__ == "__main__":
     import sys
     from pathlib import Path
@@ -49,11 +49,10 @@ See the LabOne Programming Manual for further help:
 https://docs.zhinst.com/labone_programming_manual/
 """
 
+import threading
 import time
 import numpy as np
 import zhinst.utils
-from matplotlib import pyplot
-from matplotlib import cm
 
 
 def run_example(
@@ -63,8 +62,14 @@ def run_example(
     hf2: bool = False,
     amplitude: float = 0.25,
     plot: bool = True,
+    axis=None,
 ):
-    """run the example."""
+    """
+    run the example.
+
+    The data is plotted into `axis` if given (it is cleared first), otherwise
+    into a new figure which is shown.
+    """
 
     apilevel_example = 1 if hf2 else 6  # The API level supported by this example.
     if not server_port:
@@ -93,25 +98,26 @@ def run_example(
     demod_rate = 10e3
     time_constant = 0.01
     frequency = 400e3
+    sigin_path = f"/{device}/sigins/{in_channel}"
+    demod_path = f"/{device}/demods/{demod_index}"
+    sigout_path = f"/{device}/sigouts/{out_channel}"
+    amplitude_path = f"{sigout_path}/amplitudes/{out_mixer_channel}"
     exp_setting = [
-        ["/%s/sigins/%d/ac" % (device, in_channel), 0],
-        ["/%s/sigins/%d/imp50" % (device, in_channel), 0],
-        ["/%s/sigins/%d/range" % (device, in_channel), 3 * amplitude],
-        ["/%s/demods/%d/enable" % (device, demod_index), 1],
-        ["/%s/demods/%d/rate" % (device, demod_index), demod_rate],
-        ["/%s/demods/%d/adcselect" % (device, demod_index), in_channel],
-        ["/%s/demods/%d/order" % (device, demod_index), 4],
-        ["/%s/demods/%d/timeconstant" % (device, demod_index), time_constant],
-        ["/%s/demods/%d/oscselect" % (device, demod_index), osc_index],
-        ["/%s/demods/%d/harmonic" % (device, demod_index), 1],
-        ["/%s/oscs/%d/freq" % (device, osc_index), frequency],
-        ["/%s/sigouts/%d/on" % (device, out_channel), 1],
-        ["/%s/sigouts/%d/enables/%d" % (device, out_channel, out_mixer_channel), 1],
-        ["/%s/sigouts/%d/range" % (device, out_channel), 1],
-        [
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            amplitude,
-        ],
+        [f"{sigin_path}/ac", 0],
+        [f"{sigin_path}/imp50", 0],
+        [f"{sigin_path}/range", 3 * amplitude],
+        [f"{demod_path}/enable", 1],
+        [f"{demod_path}/rate", demod_rate],
+        [f"{demod_path}/adcselect", in_channel],
+        [f"{demod_path}/order", 4],
+        [f"{demod_path}/timeconstant", time_constant],
+        [f"{demod_path}/oscselect", osc_index],
+        [f"{demod_path}/harmonic", 1],
+        [f"/{device}/oscs/{osc_index}/freq", frequency],
+        [f"{sigout_path}/on", 1],
+        [f"{sigout_path}/enables/{out_mixer_channel}", 1],
+        [f"{sigout_path}/range", 1],
+        [amplitude_path, amplitude],
     ]
     daq.set(exp_setting)
 
@@ -128,22 +134,12 @@ def run_example(
     sigouts_low = 1.0 * amplitude
     num_pulses = 20
 
-    # Configure the Data Acquisition Module.
-    # Set the device that will be used for the trigger - this parameter must be set.
-    daq_module.set("device", device)
     # We will trigger on the demodulator sample's R value.
-    trigger_path = "/%s/demods/%d/sample.r" % (device, demod_index)
+    trigger_path = f"{demod_path}/sample.r"
     triggernode = trigger_path
-    daq_module.set("triggernode", triggernode)
-    # Use an edge trigger.
-    daq_module.set("type", 4)  # 4 = tracking edge
-    daq_module.set("bandwidth", 2)
-    # Trigger on the positive edge.
-    daq_module.set("edge", 1)  # 1 = positive
     # The set the trigger level.
     trigger_level = (sigouts_high - sigouts_low) / 5
     print(f"Setting level to {trigger_level:.3f}.")
-    daq_module.set("level", trigger_level)
     # Set the trigger hysteresis to a percentage of the trigger level: This
     # ensures that triggering is robust in the presence of noise. The trigger
     # becomes armed when the signal passes through the hysteresis value and will
@@ -153,41 +149,57 @@ def run_example(
     # trigger).
     trigger_hysteresis = 0.5 * trigger_level
     print(f"Setting hysteresis {trigger_hysteresis:.3f}.")
-    daq_module.set("hysteresis", trigger_hysteresis)
     # The number of times to trigger.
     trigger_count = int(num_pulses / 2)
-    daq_module.set("count", trigger_count)
-    daq_module.set("holdoff/count", 0)
-    daq_module.set("holdoff/time", 0.100)
     trigger_delay = -0.050
-    daq_module.set("delay", trigger_delay)
-    demod_rate = daq.getDouble("/%s/demods/%d/rate" % (device, demod_index))
-    # 'grid/mode' - Specify the interpolation method of
-    #   the returned data samples.
-    #
-    # 1 = Nearest. If the interval between samples on the grid does not match
-    #     the interval between samples sent from the device exactly, the nearest
-    #     sample (in time) is taken.
-    #
-    # 2 = Linear interpolation. If the interval between samples on the grid does
-    #     not match the interval between samples sent from the device exactly,
-    #     linear interpolation is performed between the two neighbouring
-    #     samples.
-    #
-    # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
-    #     from the device) defines the interval between samples on the DAQ
-    #     Module's grid. If multiple signals are subscribed, these are
-    #     interpolated onto the grid (defined by the signal with the highest
-    #     rate, "highest_rate"). In this mode, duration is
-    #     read-only and is defined as num_cols/highest_rate.
-    daq_module.set("grid/mode", 4)
     # The length of time to record each time we trigger
     trigger_duration = 0.300
-    daq_module.set("duration", trigger_duration)
     # To keep our desired duration we must calculate the number of samples so that it
     # fits with the demod sampling rate. Otherwise in exact mode, it will be adjusted to fit.
+    # The device may round the demodulator rate. We don't need to read it back: In
+    # exact grid mode the module adjusts the duration to the actual rate, which we
+    # read back from the module below.
     sample_count = int(demod_rate * trigger_duration)
-    daq_module.set("grid/cols", sample_count)
+
+    # Configure the Data Acquisition Module with a single set() call.
+    daq_module_setting = [
+        # Set the device that will be used for the trigger - this parameter must be set.
+        ["device", device],
+        ["triggernode", triggernode],
+        # Use an edge trigger.
+        ["type", 4],  # 4 = tracking edge
+        ["bandwidth", 2],
+        # Trigger on the positive edge.
+        ["edge", 1],  # 1 = positive
+        ["level", trigger_level],
+        ["hysteresis", trigger_hysteresis],
+        ["count", trigger_count],
+        ["holdoff/count", 0],
+        ["holdoff/time", 0.100],
+        ["delay", trigger_delay],
+        # 'grid/mode' - Specify the interpolation method of
+        #   the returned data samples.
+        #
+        # 1 = Nearest. If the interval between samples on the grid does not match
+        #     the interval between samples sent from the device exactly, the nearest
+        #     sample (in time) is taken.
+        #
+        # 2 = Linear interpolation. If the interval between samples on the grid does
+        #     not match the interval between samples sent from the device exactly,
+        #     linear interpolation is performed between the two neighbouring
+        #     samples.
+        #
+        # 4 = Exact. The subscribed signal with the highest sampling rate (as sent
+        #     from the device) defines the interval between samples on the DAQ
+        #     Module's grid. If multiple signals are subscribed, these are
+        #     interpolated onto the grid (defined by the signal with the highest
+        #     rate, "highest_rate"). In this mode, duration is
+        #     read-only and is defined as num_cols/highest_rate.
+        ["grid/mode", 4],
+        ["duration", trigger_duration],
+        ["grid/cols", sample_count],
+    ]
+    daq_module.set(daq_module_setting)
     trigger_duration = daq_module.getDouble("duration")
     # The size of the internal buffer used to record triggers (in seconds), this
     # should be larger than trigger_duration.
@@ -195,7 +207,7 @@ def run_example(
 
     # We subscribe to the same demodulator sample we're triggering on, but we
     # could additionally subscribe to other node paths.
-    signal_path = "/%s/demods/%d/sample.r" % (device, demod_index)
+    signal_path = f"{demod_path}/sample.r"
     daq_module.subscribe(signal_path)
 
     # Start the Data Acquisition's thread.
@@ -205,44 +217,63 @@ def run_example(
     # Generate some pulses on the signal outputs by changing the signal output
     # mixer's amplitude. This is for demonstration only and is not necessary to
     # configure the module, we simply generate a signal upon which we can trigger.
-    daq.setDouble(
-        "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-        sigouts_low,
-    )
+    daq.setDouble(amplitude_path, sigouts_low)
     daq.sync()
     time.sleep(0.5)
-    for i in range(num_pulses):
-        daq.setDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_low * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
-        daq.sync()
-        time.sleep(0.2)
-        daq.setDouble(
-            "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-            sigouts_high * (1 + 0.05 * np.random.uniform(-1, 1, 1)[0]),
-        )
-        daq.sync()
-        time.sleep(0.1)
-        # Check and display the progress.
-        progress = daq_module.progress()
-        print(
-            f"Data Acquisition Module progress (acquiring {trigger_count:d} triggers): \
-                {progress[0]:.2%}.",
-            end="\r",
-        )
-        # Check whether the Data Acquisition Module has finished.
-        if daq_module.finished():
-            print("\nTrigger is finished.")
-            break
+    # Draw the random amplitude jitter of all pulses at once.
+    rng = np.random.default_rng()
+    jitter = rng.uniform(-1.0, 1.0, size=(num_pulses, 2))
+    amplitudes_low = (sigouts_low * (1 + 0.05 * jitter[:, 0])).tolist()
+    amplitudes_high = (sigouts_high * (1 + 0.05 * jitter[:, 1])).tolist()
+    # The pulses are generated in a background thread, so that the main thread can
+    # check the module's progress independently of the pulses' timing. The main
+    # thread does not use `daq` while the pulse thread runs.
+    stop_pulses = threading.Event()
+    pulse_errors = []
+
+    def generate_pulses():
+        """Generate num_pulses pulses or fewer if stop_pulses is set."""
+        try:
+            for i in range(num_pulses):
+                if stop_pulses.is_set():
+                    return
+                # The 0.2 s low phase is far longer than the time the setting takes
+                # to propagate, only the rising edge below needs an explicit sync().
+                daq.setDouble(amplitude_path, amplitudes_low[i])
+                stop_pulses.wait(0.2)
+                daq.setDouble(amplitude_path, amplitudes_high[i])
+                daq.sync()
+                stop_pulses.wait(0.1)
+        except Exception as error:
+            # Pass the error on to be raised in the main thread.
+            pulse_errors.append(error)
+
+    pulse_thread = threading.Thread(target=generate_pulses)
+    pulse_thread.start()
+    try:
+        while pulse_thread.is_alive():
+            # Check and display the progress.
+            progress = daq_module.progress()
+            print(
+                f"Data Acquisition Module progress (acquiring {trigger_count:d} triggers): \
+                    {progress[0]:.2%}.",
+                end="\r",
+            )
+            # Check whether the Data Acquisition Module has finished.
+            if daq_module.finished():
+                print("\nTrigger is finished.")
+                break
+            time.sleep(0.05)
+    finally:
+        stop_pulses.set()
+        pulse_thread.join()
+    if pulse_errors:
+        raise pulse_errors[0]
     print("")
-    daq.setDouble(
-        "/%s/sigouts/%d/amplitudes/%d" % (device, out_channel, out_mixer_channel),
-        sigouts_low,
-    )
+    daq.setDouble(amplitude_path, sigouts_low)
 
     # Wait for the Data Acquisition's buffers to finish processing the triggers.
-    time.sleep(2 * buffer_size)
+    wait_finished(daq_module, timeout=2 * buffer_size)
 
     # Read the Data Acquisition's data, this command can also be executed before
     # daq_module.finished() is True. In that case data recorded up to that point in
@@ -271,7 +302,7 @@ def run_example(
         Expected: `{trigger_count}`."
 
     # Get the sampling rate of the device's ADCs, the device clockbase.
-    clockbase = float(daq.getInt("/%s/clockbase" % device))
+    clockbase = float(daq.getInt(f"/{device}/clockbase"))
     # Use the clockbase to calculate the duration of the first signal segment's
     # demodulator data, the segments are accessed by indexing `samples`.
     dt_seconds = (
@@ -282,8 +313,18 @@ def run_example(
     )
 
     if plot and samples:
-
-        _, axis = pyplot.subplots()
+        # Only import Matplotlib (and initialize a GUI backend) if we plot.
+        from matplotlib import cm
+        from matplotlib.collections import LineCollection
+
+        show_plot = axis is None
+        if show_plot:
+            import matplotlib.pyplot as plt
+
+            _, axis = plt.subplots()
+        else:
+            # Reuse the caller's axis, e.g. when run_example is called repeatedly.
+            axis.clear()
         # Plot some relevant Data Acquisition parameters.
         axis.axvline(0.0, linewidth=2, linestyle="--", color="k", label="Trigger time")
         axis.axvline(
@@ -314,27 +355,56 @@ def run_example(
         )
         # Plot the signal segments returned by the Data Acquisition.
         colors = cm.rainbow(np.linspace(0, 1, len(samples)))
-        for i, sample in enumerate(samples):
-            # Align the triggers using their trigger timestamps which are stored in the chunk
-            # header "changed" timestamp. This is the timestamp of the last acquired trigger.
-            # Note that with the new software trigger, the trigger timestamp has the trigger offset
-            # added to it, so we need to subtract it to get the sample and trigger timestamps to
-            # align.
-            trigger_ts = sample["header"]["changedtimestamp"] - int(
-                sample["header"]["gridcoloffset"] * clockbase
+        # The tracking trigger's lowpass filter values. Plotting them allows us to
+        # verify that the filter's bandwidth (bandwidth) is configured
+        # appropriately.
+        lowpass_path = f"/{device}/trigger/lowpass"
+        lowpass = data[lowpass_path]
+        # Align the triggers using their trigger timestamps which are stored in the chunk
+        # header "changed" timestamp. This is the timestamp of the last acquired trigger.
+        # Note that with the new software trigger, the trigger timestamp has the trigger offset
+        # added to it, so we need to subtract it to get the sample and trigger timestamps to
+        # align.
+        # The timestamps are subtracted as integers, which is exact, and only the
+        # differences are converted to seconds.
+        changed_timestamps = np.array(
+            [sample["header"]["changedtimestamp"] for sample in samples],
+            dtype=np.int64,
+        ).ravel()
+        grid_col_offsets = np.array(
+            [sample["header"]["gridcoloffset"] for sample in samples], dtype=float
+        ).ravel()
+        trigger_timestamps = changed_timestamps - (grid_col_offsets * clockbase).astype(
+            np.int64
+        )
+        inv_clockbase = 1.0 / clockbase
+        # Compute the time axes of all segments and their lowpass filter values at
+        # once, all segments have the same number of samples.
+        timestamps = np.array(
+            [sample["timestamp"][0] for sample in samples], dtype=np.int64
+        )
+        t = (timestamps - trigger_timestamps[:, np.newaxis]) * inv_clockbase
+        timestamps_lowpass = np.array(
+            [segment["timestamp"][0] for segment in lowpass], dtype=np.int64
+        )
+        t_lowpass = (
+            timestamps_lowpass - trigger_timestamps[:, np.newaxis]
+        ) * inv_clockbase
+        # Plot all segments and all lowpass filter values as one LineCollection each,
+        # a LineCollection draws all its lines as a single artist.
+        values = np.stack([sample["value"][0] for sample in samples])
+        values_lowpass = np.stack([segment["value"][0] for segment in lowpass])
+        for times, lines_values, linestyle in (
+            (t, values, "solid"),
+            (t_lowpass, values_lowpass, "dashed"),
+        ):
+            lines = np.empty(times.shape + (2,))
+            lines[..., 0] = times
+            lines[..., 1] = lines_values
+            axis.add_collection(
+                LineCollection(lines, colors=colors, linestyles=linestyle)
             )
-            t = (sample["timestamp"] - float(trigger_ts)) / clockbase
-            axis.plot(t[0], sample["value"][0], color=colors[i])
-
-            # Plot the tracking trigger's lowpass filter values. This allows us
-            # to verify that the filter's bandwidth (bandwidth) is
-            # configured appropriately.
-            lowpass_path = "/%s/trigger/lowpass" % device
-            t_lowpass = (
-                data[lowpass_path][i]["timestamp"] - float(trigger_ts)
-            ) / clockbase
-            value_lowpass = data[lowpass_path][i]["value"]
-            axis.plot(t_lowpass[0], value_lowpass[0], "--", color=colors[i])
+        axis.autoscale_view()
 
         axis.grid(True)
         axis.set_title(
@@ -348,8 +418,19 @@ def run_example(
         axis.set_ylim([round(0.5 * amplitude, 2), round(1.5 * amplitude, 2)])
         handles, labels = axis.get_legend_handles_labels()
         axis.legend(handles, labels, fontsize="small")
-        pyplot.draw()
-        pyplot.show()
+        if show_plot:
+            plt.draw()
+            plt.show()
+
+
+def wait_finished(daq_module, timeout, poll_interval=0.02):
+    """
+    Wait until the Data Acquisition Module has finished or the timeout (in
+    seconds) has passed, whichever happens first.
+    """
+    start = time.monotonic()
+    while not daq_module.finished() and time.monotonic() - start < timeout:
+        time.sleep(poll_interval)
 
 
 if __name__ == "__main__":
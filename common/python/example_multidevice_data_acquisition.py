@@ -67,25 +67,18 @@ def run_example(
     daq = zhinst.core.ziDAQServer(server_host, server_port, apilevel_example)
     discovery = zhinst.core.ziDiscovery()
 
+    # The leader's properties come first, followed by the followers' properties.
     props = []
-    # Leader ID
-    device_serial = discovery.find(device_id_leader).lower()
-    props.append(discovery.get(device_serial))
-    # Follower IDs
-    for device_id in device_ids_follower:
+    for device_id in [device_id_leader] + device_ids_follower:
         device_serial = discovery.find(device_id).lower()
         props.append(discovery.get(device_serial))
-    devices = props[0]["deviceid"]
-    for prop in props[1:]:
-        devices += "," + prop["deviceid"]
+    devices = ",".join(prop["deviceid"] for prop in props)
     # Switching between MFLI and UHFLI
-    device_type = props[0]["devicetype"]
-    for prop in props[1:]:
-        if prop["devicetype"] != device_type:
-            raise Exception(
-                "This example needs 2 or more MFLI instruments or 2 or more UHFLI instruments."
-                "Mixing device types is not possible"
-            )
+    if len({prop["devicetype"] for prop in props}) > 1:
+        raise Exception(
+            "This example needs 2 or more MFLI instruments or 2 or more UHFLI instruments."
+            "Mixing device types is not possible"
+        )
 
     for prop in props:
         if prop["devicetype"] == "UHFLI":
@@ -99,7 +92,7 @@ def run_example(
 
     #  Device synchronization
     if synchronize:
-        print("Synchronizing devices %s ...\n" % devices)
+        print(f"Synchronizing devices {devices} ...\n")
         mds = daq.multiDeviceSyncModule()
         mds.set("start", 0)
         mds.set("group", 0)
@@ -110,8 +103,12 @@ def run_example(
         timeout = 20
         start = time.time()
         status = 0
+        # Poll with an exponential backoff from 10 ms to 200 ms: A fast sync is
+        # detected quickly and a slow one doesn't flood the data server with requests.
+        poll_interval = 0.01
         while status != 2:
-            time.sleep(0.2)
+            time.sleep(poll_interval)
+            poll_interval = min(1.5 * poll_interval, 0.2)
             status = mds.getInt("status")
             if status == -1:
                 raise Exception("Error during device sync")
@@ -123,9 +120,9 @@ def run_example(
     # Device settings
     demod_c = 0  # demod channel, for paths on the device
     out_c = 0  # signal output channel
-    # Get the value of the instrument's default Signal Output mixer channel.
-    prop = discovery.get(props[0]["deviceid"])
-    out_mixer_c = zhinst.utils.default_output_mixer_channel(prop, out_c)
+    # Get the value of the instrument's default Signal Output mixer channel from the
+    # leader's properties, they were already discovered above.
+    out_mixer_c = zhinst.utils.default_output_mixer_channel(props[0], out_c)
     in_c = 0  # signal input channel
     osc_c = 0  # oscillator
 
@@ -137,39 +134,36 @@ def run_example(
 
     # Leader device settings
     leader = props[0]["deviceid"].lower()
-    daq.setInt("/%s/sigouts/%d/on" % (leader, out_c), 1)
-    daq.setDouble("/%s/sigouts/%d/range" % (leader, out_c), 1)
-    daq.setDouble(
-        "/%s/sigouts/%d/amplitudes/%d" % (leader, out_c, out_mixer_c), out_amp
-    )
-    daq.setDouble("/%s/demods/%d/phaseshift" % (leader, demod_c), 0)
-    daq.setInt("/%s/demods/%d/order" % (leader, demod_c), filter_order)
-    daq.setDouble("/%s/demods/%d/rate" % (leader, demod_c), demod_rate)
-    daq.setInt("/%s/demods/%d/harmonic" % (leader, demod_c), 1)
-    daq.setInt("/%s/demods/%d/enable" % (leader, demod_c), 1)
-    daq.setInt("/%s/demods/%d/oscselect" % (leader, demod_c), osc_c)
-    daq.setInt("/%s/demods/%d/adcselect" % (leader, demod_c), in_c)
-    daq.setDouble("/%s/demods/%d/timeconstant" % (leader, demod_c), time_constant)
-    daq.setDouble("/%s/oscs/%d/freq" % (leader, osc_c), osc_freq)
-    daq.setInt("/%s/sigins/%d/imp50" % (leader, in_c), 1)
-    daq.setInt("/%s/sigins/%d/ac" % (leader, in_c), 0)
-    daq.setDouble("/%s/sigins/%d/range" % (leader, in_c), out_amp / 2)
-    daq.setDouble("/%s/sigouts/%d/enables/%d" % (leader, out_c, out_mixer_c), 0)
-    # Follower device settings
-    for prop in props[1:]:
-        follower = prop["deviceid"].lower()
-        daq.setDouble("/%s/demods/%d/phaseshift" % (follower, demod_c), 0)
-        daq.setInt("/%s/demods/%d/order" % (follower, demod_c), filter_order)
-        daq.setDouble("/%s/demods/%d/rate" % (follower, demod_c), demod_rate)
-        daq.setInt("/%s/demods/%d/harmonic" % (follower, demod_c), 1)
-        daq.setInt("/%s/demods/%d/enable" % (follower, demod_c), 1)
-        daq.setInt("/%s/demods/%d/oscselect" % (follower, demod_c), osc_c)
-        daq.setInt("/%s/demods/%d/adcselect" % (follower, demod_c), in_c)
-        daq.setDouble("/%s/demods/%d/timeconstant" % (follower, demod_c), time_constant)
-        daq.setDouble("/%s/oscs/%d/freq" % (follower, osc_c), osc_freq)
-        daq.setInt("/%s/sigins/%d/imp50" % (follower, in_c), 1)
-        daq.setInt("/%s/sigins/%d/ac" % (follower, in_c), 0)
-        daq.setDouble("/%s/sigins/%d/range" % (follower, in_c), out_amp / 2)
+    followers = [prop["deviceid"].lower() for prop in props[1:]]
+    leader_sigout_path = f"/{leader}/sigouts/{out_c}"
+    # Enabling the leader's signal output mixer channel sends the trigger.
+    trigger_enable_path = f"{leader_sigout_path}/enables/{out_mixer_c}"
+    exp_setting = [
+        [f"{leader_sigout_path}/on", 1],
+        [f"{leader_sigout_path}/range", 1],
+        [f"{leader_sigout_path}/amplitudes/{out_mixer_c}", out_amp],
+        [trigger_enable_path, 0],
+    ]
+    # Demodulator and signal input settings, the same for the leader and followers
+    for device in [leader] + followers:
+        demod_path = f"/{device}/demods/{demod_c}"
+        sigin_path = f"/{device}/sigins/{in_c}"
+        exp_setting += [
+            [f"{demod_path}/phaseshift", 0],
+            [f"{demod_path}/order", filter_order],
+            [f"{demod_path}/rate", demod_rate],
+            [f"{demod_path}/harmonic", 1],
+            [f"{demod_path}/enable", 1],
+            [f"{demod_path}/oscselect", osc_c],
+            [f"{demod_path}/adcselect", in_c],
+            [f"{demod_path}/timeconstant", time_constant],
+            [f"/{device}/oscs/{osc_c}/freq", osc_freq],
+            [f"{sigin_path}/imp50", 1],
+            [f"{sigin_path}/ac", 0],
+            [f"{sigin_path}/range", out_amp / 2],
+        ]
+    # Configure all devices with a single set() call.
+    daq.set(exp_setting)
     # Synchronization
     daq.sync()
     time.sleep(1)
@@ -223,14 +217,14 @@ def run_example(
     #     SAMPLE.AUXIN0 = Auxilliary input 1 value
     #     SAMPLE.AUXIN1 = Auxilliary input 2 value
     #     SAMPLE.DIO = Digital I/O value
-    triggernode = "/%s/demods/%d/sample.r" % (leader, demod_c)
+    triggernode = f"/{leader}/demods/{demod_c}/sample.r"
     daq_module.set("triggernode", triggernode)
     #   edge:
     #     POS_EDGE = 1
     #     NEG_EDGE = 2
     #     BOTH_EDGE = 3
     daq_module.set("edge", 1)
-    demod_rate = daq.getDouble("/%s/demods/%d/rate" % (leader, demod_c))
+    # demod_rate was set above, there's no need to read it back from the device.
     # Exact mode: To preserve our desired trigger duration, we have to set
     # the number of grid columns to exactly match.
     trigger_duration = time_constant * 30
@@ -255,20 +249,25 @@ def run_example(
 
     # Subscribe to the demodulators
     daq_module.unsubscribe("*")
-    leader_subscribe_node = "/%s/demods/%d/sample.r" % (leader, demod_c)
-    daq_module.subscribe(leader_subscribe_node)
-    for prop in props[1:]:
-        follower_subscribe_node = "/%s/demods/%d/sample.r" % (prop["deviceid"], demod_c)
-        daq_module.subscribe(follower_subscribe_node)
+    subscribe_nodes = {
+        device: f"/{device}/demods/{demod_c}/sample.r"
+        for device in [leader] + followers
+    }
+    for subscribe_node in subscribe_nodes.values():
+        daq_module.subscribe(subscribe_node)
 
     # Execute the module
     daq_module.execute()
     # Send a trigger
-    daq.setDouble("/%s/sigouts/%d/enables/%d" % (leader, out_c, out_mixer_c), 1)
+    daq.setDouble(trigger_enable_path, 1)
 
     # wait for the acquisition to be finished
     timeout = 20
     t0_measurement = time.time()
+    # Poll with an exponential backoff from 10 ms to 200 ms.
+    poll_interval = 0.01
+    # Only print the progress if it has advanced by at least 1%.
+    printed_progress = -1.0
     while not daq_module.finished():
         if time.time() - t0_measurement > timeout:
             raise Exception(
@@ -276,14 +275,18 @@ def run_example(
                 "Are the streaming nodes enabled? "
                 "Has a valid signal_path been specified?"
             )
-        time.sleep(1)
-        print(f"Progress {daq_module.progress()[0]:.2%}", end="\r")
+        time.sleep(poll_interval)
+        poll_interval = min(1.5 * poll_interval, 0.2)
+        progress = daq_module.progress()[0]
+        if progress - printed_progress >= 0.01:
+            print(f"Progress {progress:.2%}", end="\r")
+            printed_progress = progress
 
     # Read the result
     result = daq_module.read(True)
 
     # Turn off the trigger
-    daq.setDouble("/%s/sigouts/%d/enables/%d" % (leader, out_c, out_mixer_c), 0)
+    daq.setDouble(trigger_enable_path, 0)
     # Finish the DAQ module
     daq_module.finish()
 
@@ -291,71 +294,59 @@ def run_example(
 
     if plot:
 
-        # Leader data
-        leader_clockbase = daq.getDouble("/%s/clockbase" % leader)
-        timestamp = result[leader_subscribe_node][0]["timestamp"]
-        leader_time = (timestamp[0] - float(timestamp[0][0])) / leader_clockbase
-        demod_r_leader = result[leader_subscribe_node][0]["value"][0]
-        # Plotting
-        _, (axis1, axis2) = plt.subplots(2)
-        axis1.plot(leader_time * 1e3, demod_r_leader * 1e3, color="blue")
-        axis1.set_ylabel("Amplitude [mV]", fontsize=12, color="k")
-        axis1.legend(["Leader"])
-        axis1.set_title("Transient Measurement by DAQ Module")
-        axis1.grid(True)
+        # Get the clockbases of all devices with a single request.
+        clockbase_nodes = daq.get("/*/clockbase", flat=True, settingsonly=False)
+        clockbases = {
+            device: clockbase_nodes[f"/{device}/clockbase"]["value"][0]
+            for device in subscribe_nodes
+        }
+        # Leader data, the times in ms and the amplitudes in mV. The times are
+        # scaled in place to avoid a second temporary array.
+        leader_sample = result[subscribe_nodes[leader]][0]
+        timestamp = leader_sample["timestamp"][0]
+        leader_time_ms = timestamp - float(timestamp[0])
+        leader_time_ms *= 1e3 / clockbases[leader]
+        demod_r_leader_mv = leader_sample["value"][0] * 1e3
+
+        # Plotting: The left column shows the leader and followers separately, the
+        # right column shows them combined and their time difference.
+        fig, ((axis1, axis3), (axis2, axis4)) = plt.subplots(
+            nrows=2, ncols=2, figsize=(12, 6), sharex=True
+        )
+        axis1.plot(leader_time_ms, demod_r_leader_mv, color="blue")
+        axis3.plot(leader_time_ms, demod_r_leader_mv, color="blue")
+
+        # Follower data, computed once and plotted into all axes in the same pass.
+        for follower in followers:
+            follower_sample = result[subscribe_nodes[follower]][0]
+            follower_timestamp = follower_sample["timestamp"][0]
+            follower_time_ms = follower_timestamp - float(follower_timestamp[0])
+            follower_time_ms *= 1e3 / clockbases[follower]
+            follower_demod_r_mv = follower_sample["value"][0] * 1e3
+            axis2.plot(follower_time_ms, follower_demod_r_mv, color="red")
+            axis3.plot(follower_time_ms, follower_demod_r_mv, color="red")
+            axis4.plot(
+                follower_time_ms, leader_time_ms - follower_time_ms, color="green"
+            )
 
-        # Follower data
-        for prop in props[1:]:
-            follower = prop["deviceid"].lower()
-            follower_subscribe_node = "/%s/demods/%d/sample.r" % (follower, demod_c)
-            follower_clockbase = daq.getDouble("/%s/clockbase" % follower)
-            follower_timestamp = result[follower_subscribe_node][0]["timestamp"]
-            follower_time = (
-                follower_timestamp[0] - float(follower_timestamp[0][0])
-            ) / follower_clockbase
-            follower_demod_r = result[follower_subscribe_node][0]["value"][0]
-
-            axis2 = plt.subplot(2, 1, 2)
-            axis2.plot(follower_time * 1e3, follower_demod_r * 1e3, color="red")
-            axis2.legend(["Followers"])
-            axis2.set_xlabel("Time [ms]", fontsize=12, color="k")
-            axis2.set_ylabel("Amplitude [mV]", fontsize=12, color="k")
-            axis2.grid(True)
-
-        fig, (axis1, axis2) = plt.subplots(2)
-        axis1.plot(leader_time * 1e3, demod_r_leader * 1e3, color="blue")
-
-        for prop in props[1:]:
-            follower = prop["deviceid"].lower()
-            follower_subscribe_node = "/%s/demods/%d/sample.r" % (follower, demod_c)
-            follower_clockbase = daq.getDouble("/%s/clockbase" % follower)
-            follower_timestamp = result[follower_subscribe_node][0]["timestamp"]
-            follower_time = (
-                follower_timestamp[0] - float(follower_timestamp[0][0])
-            ) / follower_clockbase
-            follower_demod_r = result[follower_subscribe_node][0]["value"][0]
-            axis1.plot(follower_time * 1e3, follower_demod_r * 1e3, color="red")
         axis1.set_ylabel("Amplitude [mV]", fontsize=12, color="k")
-        axis1.legend(["Leader", "Followers"])
+        axis1.legend(["Leader"])
         axis1.set_title("Transient Measurement by DAQ Module")
         axis1.grid(True)
-
-        for prop in props[1:]:
-            follower = prop["deviceid"].lower()
-            follower_subscribe_node = "/%s/demods/%d/sample.r" % (follower, demod_c)
-            follower_clockbase = daq.getDouble("/%s/clockbase" % follower)
-            follower_timestamp = result[follower_subscribe_node][0]["timestamp"]
-            follower_time = (
-                follower_timestamp[0] - float(follower_timestamp[0][0])
-            ) / follower_clockbase
-            axis2.plot(
-                follower_time * 1e3, (leader_time - follower_time) * 1e3, color="green"
-            )
-        axis2.set_title("Time Difference between Leader and Followers")
+        axis2.legend(["Followers"])
         axis2.set_xlabel("Time [ms]", fontsize=12, color="k")
-        axis2.set_ylabel("Time difference [ms]", fontsize=12, color="k")
+        axis2.set_ylabel("Amplitude [mV]", fontsize=12, color="k")
         axis2.grid(True)
 
+        axis3.set_ylabel("Amplitude [mV]", fontsize=12, color="k")
+        axis3.legend(["Leader", "Followers"])
+        axis3.set_title("Transient Measurement by DAQ Module")
+        axis3.grid(True)
+        axis4.set_title("Time Difference between Leader and Followers")
+        axis4.set_xlabel("Time [ms]", fontsize=12, color="k")
+        axis4.set_ylabel("Time difference [ms]", fontsize=12, color="k")
+        axis4.grid(True)
+
         fig.set_tight_layout(True)
 
         plt.show()
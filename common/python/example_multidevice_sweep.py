@@ -156,8 +156,12 @@ def run_example(
 
         timeout = 20
         tstart = time.time()
+        # Poll with an exponential backoff from 10 ms to 200 ms: A fast sync is
+        # detected quickly and a slow one doesn't flood the data server with requests.
+        poll_interval = 0.01
         while True:
-            time.sleep(0.2)
+            time.sleep(poll_interval)
+            poll_interval = min(1.5 * poll_interval, 0.2)
             status = md_sync_module.getInt("status")
             assert status != -1, "Error during device sync"
             if status == 2:
@@ -248,10 +252,17 @@ def run_example(
 
     start = time.time()
     timeout = 60  # [s]
+    # Poll with an exponential backoff from 10 ms to 500 ms.
+    poll_interval = 0.01
+    # Only print the progress if it has advanced by at least 1%.
+    printed_progress = -1.0
     while not sweeper.finished():  # Wait until the sweep is complete, with timeout.
-        time.sleep(0.5)
-        progress = sweeper.progress()
-        print(f"Individual sweep progress: {progress[0]:.2%}.", end="\n")
+        time.sleep(poll_interval)
+        poll_interval = min(1.5 * poll_interval, 0.5)
+        progress = sweeper.progress()[0]
+        if progress - printed_progress >= 0.01:
+            print(f"Individual sweep progress: {progress:.2%}.", end="\n")
+            printed_progress = progress
         # Here we could read intermediate data via:
         # data = sweeper.read(True)...
         # and process it while the sweep is completing.
@@ -321,8 +332,11 @@ def run_example(
         md_sync_module.set("start", 0)
         timeout = 2
         tstart = time.time()
+        # Poll with an exponential backoff from 10 ms to 100 ms.
+        poll_interval = 0.01
         while True:
-            time.sleep(0.1)
+            time.sleep(poll_interval)
+            poll_interval = min(1.5 * poll_interval, 0.1)
             status = md_sync_module.getInt("status")
             assert status != -1, "Error during device sync stop"
             if status == 0: